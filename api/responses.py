@@ -0,0 +1,20 @@
+"""
+Response classes for the Event Networking AI System API
+"""
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's Rust serializer.
+    Encodes datetimes, enums and floats natively, without the stdlib json walk.
+    Unlike JSONResponse, which raises on NaN/Infinity (a 500), non-finite
+    floats such as a NaN similarity score or average are sent as null.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content, inf_nan_mode='null')
@@ -5,18 +5,19 @@ FastAPI endpoints for user management, events, recommendations, and clustering
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import datetime
+import asyncio
 import logging
 import networkx as nx
 import pandas as pd
 import io
 import csv
 
-from database.connection import get_db
+from database.connection import SessionLocal, get_db
 from models.schemas import (
     UserCreate, UserProfile, EventCreate, EventInfo,
-    RecommendationRequest, BulkRecommendationResponse,
+    RecommendationRequest, BulkRecommendationResponse, BULK_RECOMMENDATION_ADAPTER,
     ClusterAnalysisRequest, ClusterAnalysisResponse,
     NetworkData, SuccessResponse, HealthCheck, EventAnalytics, UserAnalytics
 )
@@ -25,7 +26,9 @@ from services.recommendation_engine import RecommendationEngine
 from services.clustering_service import ClusteringService
 from services.data_service import DataService
 from services.linkedin_service import LinkedInService
-from fastapi.responses import JSONResponse
+from config.settings import settings
+from utils.helpers import calculate_profile_score
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import plotly
 
 logger = logging.getLogger(__name__)
@@ -84,7 +87,8 @@ async def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
             industry=user_data.industry,
             bio=user_data.bio,
             experience_years=user_data.experience_years,
-            linkedin_url=user_data.linkedin_url
+            linkedin_url=user_data.linkedin_url,
+            profile_completeness=calculate_profile_score(user_data.model_dump())
         )
 
         db.add(db_user)
@@ -113,6 +117,7 @@ async def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
             bio=db_user.bio,
             experience_years=db_user.experience_years,
             linkedin_url=db_user.linkedin_url,
+            profile_completeness=db_user.profile_completeness,
             interests=user_data.interests,
             goals=user_data.goals,
             created_at=db_user.created_at,
@@ -148,6 +153,7 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
             bio=user.bio,
             experience_years=user.experience_years,
             linkedin_url=user.linkedin_url,
+            profile_completeness=user.profile_completeness or 0.0,
             interests=interests,
             goals=goals,
             created_at=user.created_at,
@@ -198,6 +204,8 @@ async def create_event(event_data: EventCreate, db: Session = Depends(get_db)):
             event_type=db_event.event_type,
             is_active=db_event.is_active,
             attendee_count=0,
+            is_full=False,
+            is_upcoming=db_event.date > datetime.utcnow(),
             created_at=db_event.created_at
         )
 
@@ -231,6 +239,8 @@ async def get_event(event_id: int, db: Session = Depends(get_db)):
             event_type=event.event_type,
             is_active=event.is_active,
             attendee_count=attendee_count,
+            is_full=event.max_attendees is not None and attendee_count >= event.max_attendees,
+            is_upcoming=event.date > datetime.utcnow(),
             created_at=event.created_at
         )
 
@@ -330,17 +340,18 @@ async def linkedin_callback(
     """
     try:
         # Exchange code for access token
-        token_data = linkedin_service.exchange_code_for_token(authorization_code)
+        token_data = await asyncio.to_thread(linkedin_service.exchange_code_for_token, authorization_code)
         access_token = token_data.get('access_token')
         
         if not access_token:
             raise HTTPException(status_code=400, detail="Failed to obtain access token from LinkedIn")
         
         # Fetch LinkedIn profile data
-        profile_data = linkedin_service.fetch_profile(access_token)
+        profile_data = await linkedin_service.fetch_profile_async(access_token)
         
         # Create or update user
-        user = linkedin_service.create_or_update_user_from_linkedin(
+        user = await asyncio.to_thread(
+            linkedin_service.create_or_update_user_from_linkedin,
             db=db, 
             profile_data=profile_data, 
             user_id=user_id
@@ -383,10 +394,10 @@ async def get_linkedin_profile(access_token: str):
     Note: In production, store tokens securely and use proper authentication
     """
     try:
-        if not linkedin_service.validate_token(access_token):
+        if not await asyncio.to_thread(linkedin_service.validate_token, access_token):
             raise HTTPException(status_code=401, detail="Invalid or expired LinkedIn access token")
         
-        profile_data = linkedin_service.fetch_profile(access_token)
+        profile_data = await linkedin_service.fetch_profile_async(access_token, include_raw=True)
         return {
             "profile_data": profile_data,
             "message": "LinkedIn profile fetched successfully"
@@ -419,16 +430,17 @@ async def import_linkedin_data(
             raise HTTPException(status_code=404, detail="User not found")
         
         # Exchange code for token and fetch profile
-        token_data = linkedin_service.exchange_code_for_token(authorization_code)
+        token_data = await asyncio.to_thread(linkedin_service.exchange_code_for_token, authorization_code)
         access_token = token_data.get('access_token')
         
         if not access_token:
             raise HTTPException(status_code=400, detail="Failed to obtain LinkedIn access token")
         
-        profile_data = linkedin_service.fetch_profile(access_token)
+        profile_data = await linkedin_service.fetch_profile_async(access_token)
         
         # Update existing user with LinkedIn data
-        updated_user = linkedin_service.create_or_update_user_from_linkedin(
+        updated_user = await asyncio.to_thread(
+            linkedin_service.create_or_update_user_from_linkedin,
             db=db,
             profile_data=profile_data,
             user_id=user_id
@@ -511,8 +523,8 @@ async def import_attendees_from_csv(
         
         created_user_ids = []
         
-        # Process each row
-        for index, row in df.iterrows():
+        # Process each row as a plain dict; iterrows boxes every cell in a Series
+        for index, row in enumerate(df.to_dict('records')):
             try:
                 # Extract user data with defaults for missing fields
                 user_data = {
@@ -740,7 +752,7 @@ async def validate_csv_format(file: UploadFile = File(...)):
             validation["validation_errors"].append(f"Empty emails in rows: {empty_emails}")
         
         # Add sample data (first 3 rows)
-        for i, row in df.head(3).iterrows():
+        for row in df.head(3).to_dict('records'):
             sample_row = {col: str(row[col]) if pd.notna(row[col]) else "" for col in df.columns}
             validation["sample_data"].append(sample_row)
         
@@ -760,6 +772,31 @@ async def validate_csv_format(file: UploadFile = File(...)):
 # AI RECOMMENDATION ENDPOINTS
 # ════════════════════════════════════════════════════════════════════════════════
 
+def _bulk_recommendation_response(response: BulkRecommendationResponse) -> Response:
+    """Serialize a bulk response in pydantic-core instead of jsonable_encoder"""
+    return Response(
+        content=BULK_RECOMMENDATION_ADAPTER.dump_json(response),
+        media_type="application/json"
+    )
+
+
+def _generate_event_recommendations(db: Session, request: RecommendationRequest) -> Optional[tuple]:
+    """Event name and generated recommendations, or None if the event is missing"""
+    event = db.query(Event).filter(Event.id == request.event_id).first()
+    if not event:
+        return None
+    # Read before generation commits and expires the instance
+    event_name = event.name
+
+    recommendations = recommendation_engine.generate_recommendations(
+        db=db,
+        event_id=request.event_id,
+        target_user_id=request.user_id,
+        max_recommendations=request.max_recommendations
+    )
+    return event_name, recommendations
+
+
 @router.post("/recommendations/generate", response_model=BulkRecommendationResponse)
 async def generate_recommendations(
         request: RecommendationRequest,
@@ -769,28 +806,22 @@ async def generate_recommendations(
     try:
         start_time = datetime.now()
 
-        # Get event information
-        event = db.query(Event).filter(Event.id == request.event_id).first()
-        if not event:
+        # Event lookup and the ML engine run in one worker thread so other
+        # requests keep being served and the session stays on a single thread
+        result = await asyncio.to_thread(_generate_event_recommendations, db, request)
+        if result is None:
             raise HTTPException(status_code=404, detail="Event not found")
-
-        # Generate recommendations using ML engine
-        recommendations = recommendation_engine.generate_recommendations(
-            db=db,
-            event_id=request.event_id,
-            target_user_id=request.user_id,
-            max_recommendations=request.max_recommendations
-        )
+        event_name, recommendations = result
 
         if not recommendations:
-            return BulkRecommendationResponse(
+            return _bulk_recommendation_response(BulkRecommendationResponse(
                 event_id=request.event_id,
-                event_name=event.name,
+                event_name=event_name,
                 recommendations=[],
                 total_users=0,
                 generation_time_seconds=0.0,
                 algorithm_info={"status": "no_recommendations_generated"}
-            )
+            ))
 
         # Group recommendations by user
         from collections import defaultdict
@@ -825,9 +856,9 @@ async def generate_recommendations(
         end_time = datetime.now()
         generation_time = (end_time - start_time).total_seconds()
 
-        return BulkRecommendationResponse(
+        return _bulk_recommendation_response(BulkRecommendationResponse(
             event_id=request.event_id,
-            event_name=event.name,
+            event_name=event_name,
             recommendations=formatted_recommendations,
             total_users=len(formatted_recommendations),
             generation_time_seconds=generation_time,
@@ -836,7 +867,7 @@ async def generate_recommendations(
                 "version": "1.0",
                 "features_used": ["bio", "interests", "goals", "job_title", "company", "industry"]
             }
-        )
+        ))
 
     except HTTPException:
         raise
@@ -856,7 +887,8 @@ async def analyze_clusters(
 ):
     """Perform network cluster analysis on event attendees"""
     try:
-        result = clustering_service.analyze_clusters(
+        result = await asyncio.to_thread(
+            clustering_service.analyze_clusters,
             db=db,
             event_id=request.event_id,
             algorithm=request.algorithm,
@@ -874,7 +906,8 @@ async def analyze_clusters(
 async def get_network_data(event_id: int, db: Session = Depends(get_db)):
     """Get network visualization data for an event"""
     try:
-        network_data = clustering_service.export_network_for_visualization(
+        network_data = await asyncio.to_thread(
+            clustering_service.export_network_for_visualization,
             db=db,
             event_id=event_id
         )
@@ -890,12 +923,12 @@ async def get_network_data(event_id: int, db: Session = Depends(get_db)):
 async def get_cluster_map(event_id: int, db: Session = Depends(get_db)):
     """Generate and return a cluster map visualization for an event as Plotly JSON."""
     try:
-        G = clustering_service.create_network_graph(db, event_id)
+        G = await asyncio.to_thread(clustering_service.create_network_graph, db, event_id)
         if G.number_of_nodes() == 0:
             return JSONResponse(content={"error": "No attendees or insufficient data for visualization."}, status_code=404)
 
         # Use spring layout for visualization
-        pos = nx.spring_layout(G)
+        pos = await asyncio.to_thread(nx.spring_layout, G)
         edge_x = []
         edge_y = []
         for edge in G.edges():
@@ -930,7 +963,7 @@ async def get_cluster_map(event_id: int, db: Session = Depends(get_db)):
 async def get_event_analytics(event_id: int, db: Session = Depends(get_db)):
     """Get comprehensive analytics for an event"""
     try:
-        analytics = data_service.get_event_statistics(db=db, event_id=event_id)
+        analytics = await asyncio.to_thread(data_service.get_event_statistics, db=db, event_id=event_id)
 
         if not analytics:
             raise HTTPException(status_code=404, detail="Event not found")
@@ -944,6 +977,31 @@ async def get_event_analytics(event_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+def _stream_recommendations_csv(bind, event_id: int) -> Iterator[str]:
+    """
+    CSV chunks read through a session owned by the stream itself: the body is
+    sent after get_db has already closed the request session
+    """
+    with SessionLocal(bind=bind) as db:
+        yield from data_service.iter_recommendations_csv(db=db, event_id=event_id)
+
+
+@router.get("/analytics/event/{event_id}/recommendations.csv")
+async def export_event_recommendations(event_id: int, db: Session = Depends(get_db)):
+    """Stream an event's active recommendations as CSV"""
+    if not settings.enable_data_export:
+        raise HTTPException(status_code=403, detail="Data export is disabled")
+
+    if not db.query(Event.id).filter(Event.id == event_id).first():
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    return StreamingResponse(
+        _stream_recommendations_csv(db.get_bind(), event_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=event_{event_id}_recommendations.csv"}
+    )
+
+
 @router.get("/analytics/user/{user_id}", response_model=UserAnalytics)
 async def get_user_analytics(user_id: int, db: Session = Depends(get_db)):
     """Get user profile analytics"""
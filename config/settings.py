@@ -43,6 +43,13 @@ class Settings(BaseSettings):
     # Performance Settings
     max_attendees_per_event: int = 1000
     recommendation_cache_ttl: int = 300  # 5 minutes in seconds
+    row_cache_size: int = 10000  # Max cached User/Event rows per process
+    row_cache_ttl: int = 30  # Seconds a cached User/Event row is trusted (caches are per process)
+    graph_cache_ttl: int = 60  # Seconds to reuse an event's graph and communities
+    gpu_community_min_nodes: int = 2000  # Graphs this large use nx-cugraph when installed
+    ann_min_attendees: int = 5000  # Events this large use a FAISS HNSW top-k search when installed
+    parallel_recommendation_min_attendees: int = 1000  # Events this large build per-user recommendations on threads
+    parallel_recommendation_jobs: int = 4  # Threads per request for those events
     
     # Logging
     log_level: str = "INFO"
@@ -52,6 +59,8 @@ class Settings(BaseSettings):
     linkedin_client_id: Optional[str] = None
     linkedin_client_secret: Optional[str] = None
     linkedin_redirect_uri: str = "http://localhost:8000/api/v1/linkedin/callback"
+    linkedin_token_cache_ttl: int = 300  # Seconds to trust a token validation result
+    linkedin_profile_cache_ttl: int = 300  # Seconds fetched profiles stay in the shared Redis cache
     
     # External Services (for future use)
     redis_url: Optional[str] = None
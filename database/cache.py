@@ -0,0 +1,319 @@
+# Row Cache for Event Networking AI System
+"""
+In-process LRU cache for hot User/Event row reads.
+Recommendation and clustering runs look up the same attendees over and over;
+these helpers serve them from memory and are invalidated when an ORM write
+commits or rolls back. Derived per-event results (network graphs,
+communities) live in a TTL cache invalidated the same way.
+
+Every cache here is per process: a write in one worker only evicts that
+worker's entries, so row snapshots also expire after settings.row_cache_ttl
+seconds to bound how stale other workers can get.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session, selectinload
+
+from config.settings import settings
+from models.database import User, Event, EventAttendee, UserInterest, UserGoal
+
+logger = logging.getLogger(__name__)
+
+# ════════════════════════════════════════════════════════════════════════════════
+# SNAPSHOT TYPES
+# ════════════════════════════════════════════════════════════════════════════════
+
+UserSnapshot = namedtuple("UserSnapshot", [
+    "id", "name", "job_title", "company", "industry", "bio",
+    "experience_years", "interests", "goals"
+])
+
+EventSnapshot = namedtuple("EventSnapshot", [
+    "id", "name", "date", "location", "max_attendees", "event_type", "is_active"
+])
+
+# ════════════════════════════════════════════════════════════════════════════════
+# LRU CACHE
+# ════════════════════════════════════════════════════════════════════════════════
+
+class RowCache:
+    """Thread-safe LRU cache of immutable row snapshots"""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: tuple) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, row_id: int) -> None:
+        """Drop a row from every bound database"""
+        with self._lock:
+            for key in [k for k in self._data if k[1] == row_id]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(RowCache):
+    """LRU cache whose entries also expire after ttl seconds"""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        super().__init__(maxsize=maxsize)
+        self.ttl = ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            with self._lock:
+                self._data.pop(key, None)
+            return None
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        super().put(key, (time.monotonic(), value))
+
+
+user_cache = TTLCache(ttl=settings.row_cache_ttl, maxsize=settings.row_cache_size)
+event_cache = TTLCache(ttl=settings.row_cache_ttl, maxsize=settings.row_cache_size)
+event_graph_cache = TTLCache(ttl=settings.graph_cache_ttl)
+
+
+def _cache_key(db: Session, row_id: Hashable) -> tuple:
+    # Key on the bound engine itself (not its id()) so separate databases never
+    # share entries, even after an engine is garbage collected
+    return db.get_bind(), row_id
+
+
+def event_cache_key(db: Session, event_id: int, *parts: Hashable) -> tuple:
+    """Cache key for derived per-event results; invalidated with the event"""
+    return db.get_bind(), event_id, *parts
+
+# ════════════════════════════════════════════════════════════════════════════════
+# CACHED LOOKUPS
+# ════════════════════════════════════════════════════════════════════════════════
+
+def _user_to_snapshot(user: User) -> UserSnapshot:
+    return UserSnapshot(
+        id=user.id,
+        name=user.name,
+        job_title=user.job_title,
+        company=user.company,
+        industry=user.industry,
+        bio=user.bio,
+        experience_years=user.experience_years,
+        interests=tuple(i.interest for i in user.interests),
+        goals=tuple(g.goal for g in user.goals)
+    )
+
+
+def get_user_snapshot(db: Session, user_id: int) -> Optional[UserSnapshot]:
+    """Get a user with interests and goals, served from cache when possible"""
+    key = _cache_key(db, user_id)
+    snapshot = user_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    user = db.query(User).options(
+        selectinload(User.interests),
+        selectinload(User.goals)
+    ).filter(User.id == user_id).first()
+
+    if not user:
+        return None
+
+    snapshot = _user_to_snapshot(user)
+    user_cache.put(key, snapshot)
+    return snapshot
+
+
+def get_user_snapshots(db: Session, user_ids: Iterable[int]) -> Dict[int, UserSnapshot]:
+    """Bulk variant of get_user_snapshot; cache misses are loaded in one query"""
+    snapshots = {}
+    missing = []
+    for user_id in user_ids:
+        snapshot = user_cache.get(_cache_key(db, user_id))
+        if snapshot is not None:
+            snapshots[user_id] = snapshot
+        else:
+            missing.append(user_id)
+
+    if missing:
+        users = db.query(User).options(
+            selectinload(User.interests),
+            selectinload(User.goals)
+        ).filter(User.id.in_(missing)).all()
+
+        for user in users:
+            snapshot = _user_to_snapshot(user)
+            user_cache.put(_cache_key(db, user.id), snapshot)
+            snapshots[user.id] = snapshot
+
+    return snapshots
+
+
+def get_event_snapshot(db: Session, event_id: int) -> Optional[EventSnapshot]:
+    """Get an event, served from cache when possible"""
+    key = _cache_key(db, event_id)
+    snapshot = event_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    db_event = db.query(Event).filter(Event.id == event_id).first()
+    if not db_event:
+        return None
+
+    snapshot = EventSnapshot(
+        id=db_event.id,
+        name=db_event.name,
+        date=db_event.date,
+        location=db_event.location,
+        max_attendees=db_event.max_attendees,
+        event_type=db_event.event_type,
+        is_active=db_event.is_active
+    )
+    event_cache.put(key, snapshot)
+    return snapshot
+
+# ════════════════════════════════════════════════════════════════════════════════
+# TRANSACTIONAL INVALIDATION
+# ════════════════════════════════════════════════════════════════════════════════
+
+# Mapper events fire at flush, before the transaction is settled. They only
+# record what changed on the session; the caches are evicted once it commits
+# or rolls back, so entries filled from uncommitted rows (by this or any other
+# session) between flush and commit never outlive the transaction.
+
+_PENDING_KEY = "row_cache_invalidations"
+
+
+def _session_pending(session: Session) -> Dict[str, set]:
+    return session.info.setdefault(_PENDING_KEY, {
+        "users": set(), "events": set(), "graph_events": set(), "clear": set()
+    })
+
+
+def _pending(target) -> Optional[Dict[str, set]]:
+    """Pending invalidations of target's session, or None if it is detached"""
+    session = object_session(target)
+    return _session_pending(session) if session is not None else None
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target):
+    pending = _pending(target)
+    if pending is None:
+        user_cache.invalidate(target.id)
+        event_graph_cache.clear()
+        return
+    pending["users"].add(target.id)
+    # A profile change can move edges in every event the user attends
+    pending["clear"].add("graphs")
+
+
+@event.listens_for(UserInterest, "after_insert")
+@event.listens_for(UserInterest, "after_update")
+@event.listens_for(UserInterest, "after_delete")
+@event.listens_for(UserGoal, "after_insert")
+@event.listens_for(UserGoal, "after_update")
+@event.listens_for(UserGoal, "after_delete")
+def _invalidate_user_children(mapper, connection, target):
+    pending = _pending(target)
+    if pending is None:
+        user_cache.invalidate(target.user_id)
+        event_graph_cache.clear()
+        return
+    pending["users"].add(target.user_id)
+    pending["clear"].add("graphs")
+
+
+@event.listens_for(Event, "after_update")
+@event.listens_for(Event, "after_delete")
+def _invalidate_event(mapper, connection, target):
+    pending = _pending(target)
+    if pending is None:
+        event_cache.invalidate(target.id)
+        event_graph_cache.invalidate(target.id)
+        return
+    pending["events"].add(target.id)
+    pending["graph_events"].add(target.id)
+
+
+@event.listens_for(EventAttendee, "after_insert")
+@event.listens_for(EventAttendee, "after_update")
+@event.listens_for(EventAttendee, "after_delete")
+def _invalidate_event_attendees(mapper, connection, target):
+    pending = _pending(target)
+    if pending is None:
+        event_graph_cache.invalidate(target.event_id)
+        return
+    pending["graph_events"].add(target.event_id)
+
+
+@event.listens_for(Session, "after_bulk_update")
+@event.listens_for(Session, "after_bulk_delete")
+def _invalidate_bulk(context):
+    # query(...).update()/.delete() bypass mapper events, so drop everything
+    entity = context.mapper.class_
+    pending = _session_pending(context.session)
+    if entity in (User, UserInterest, UserGoal):
+        pending["clear"].update(("users", "graphs"))
+    elif entity is Event:
+        pending["clear"].update(("events", "graphs"))
+    elif entity is EventAttendee:
+        pending["clear"].add("graphs")
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _apply_invalidations(session):
+    # Rollbacks evict too: rows read inside the failed transaction may have
+    # been cached with values that never committed
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    if "users" in pending["clear"]:
+        user_cache.clear()
+    else:
+        for user_id in pending["users"]:
+            user_cache.invalidate(user_id)
+
+    if "events" in pending["clear"]:
+        event_cache.clear()
+    else:
+        for event_id in pending["events"]:
+            event_cache.invalidate(event_id)
+
+    if "graphs" in pending["clear"]:
+        event_graph_cache.clear()
+    else:
+        for event_id in pending["graph_events"]:
+            event_graph_cache.invalidate(event_id)
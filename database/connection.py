@@ -7,7 +7,7 @@ Handles SQLAlchemy engine configuration and database operations.
 import logging
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
@@ -73,6 +73,34 @@ def create_database_engine():
     
     return engine
 
+def get_async_database_url() -> str:
+    """Map the configured PostgreSQL URL onto the asyncpg driver"""
+    url = settings.database_url
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+def create_async_database_engine():
+    """
+    Create an asyncpg-backed engine for async endpoints (PostgreSQL only).
+    The sync engine above stays in place for scripts, migrations and
+    create_performance_indexes.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    if settings.database_url.startswith("sqlite"):
+        raise ValueError("Async database engine requires PostgreSQL")
+    
+    return create_async_engine(
+        get_async_database_url(),
+        pool_size=20,           # One event loop multiplexes many queries
+        max_overflow=40,
+        pool_pre_ping=False,    # Skip the extra round trip on every checkout
+        pool_recycle=1800,      # Retire connections before server-side timeouts
+        echo=settings.debug,
+    )
+
 # Create the engine instance
 engine = create_database_engine()
 
@@ -181,6 +209,30 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+_async_session_factory = None
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Dependency for async FastAPI endpoints (PostgreSQL + asyncpg).
+    The async engine is created on first use so asyncpg stays optional.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_session_factory = async_sessionmaker(
+            create_async_database_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    
+    async with _async_session_factory() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
 @contextmanager
 def get_db_session() -> Session:
     """
@@ -4,19 +4,26 @@ Creates realistic test data for users, events, and relationships
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from database.connection import create_database_engine as get_engine
 from models.database import User, Event, EventAttendee, UserInterest, UserGoal
+from models.schemas import USER_CREATE_LIST_ADAPTER
 
 logger = logging.getLogger(__name__)
 
 
-def create_sample_data(force_recreate: bool = False) -> Dict[str, int]:
-    """Create comprehensive sample data for testing"""
-    engine = get_engine()
+def create_sample_data(force_recreate: bool = False,
+                       engine: Optional[Engine] = None) -> Dict[str, int]:
+    """
+    Create comprehensive sample data for testing, in the application database
+    unless another engine is given
+    """
+    engine = engine or get_engine()
     SessionLocal = sessionmaker(bind=engine)
     db = SessionLocal()
 
@@ -116,45 +123,7 @@ def create_sample_data(force_recreate: bool = False) -> Dict[str, int]:
             }
         ]
 
-        # Create users
-        db_users = []
-        for user_data in users_data:
-            db_user = User(
-                name=user_data['name'],
-                email=user_data['email'],
-                job_title=user_data['job_title'],
-                company=user_data['company'],
-                industry=user_data['industry'],
-                bio=user_data['bio'],
-                experience_years=user_data['experience_years'],
-                linkedin_url=user_data['linkedin_url']
-            )
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
-            db_users.append(db_user)
-
-            # Add interests
-            for interest in user_data['interests']:
-                db_interest = UserInterest(
-                    user_id=db_user.id,
-                    interest=interest,
-                    proficiency_level='advanced'
-                )
-                db.add(db_interest)
-
-            # Add goals
-            for goal in user_data['goals']:
-                db_goal = UserGoal(
-                    user_id=db_user.id,
-                    goal=goal,
-                    goal_type='network'
-                )
-                db.add(db_goal)
-
-        db.commit()
-
-        # Create sample events
+        # Sample events
         events_data = [
             {
                 'name': 'AI Conference 2025',
@@ -180,50 +149,63 @@ def create_sample_data(force_recreate: bool = False) -> Dict[str, int]:
             }
         ]
 
-        db_events = []
-        for event_data in events_data:
-            db_event = Event(
-                name=event_data['name'],
-                description=event_data['description'],
-                date=event_data['date'],
-                location=event_data['location'],
-                venue=event_data['venue'],
-                city=event_data['city'],
-                country=event_data['country'],
-                max_attendees=event_data['max_attendees'],
-                event_type=event_data['event_type']
-            )
-            db.add(db_event)
-            db.commit()
-            db.refresh(db_event)
-            db_events.append(db_event)
-
-        # Register users for events (all users for first event)
-        for user in db_users:
-            registration = EventAttendee(
-                event_id=db_events[0].id,  # AI Conference
-                user_id=user.id,
-                attendance_status='registered'
-            )
-            db.add(registration)
-
-        # Register some users for second event
-        for user in db_users[:4]:
-            registration = EventAttendee(
-                event_id=db_events[1].id,  # Tech Summit
-                user_id=user.id,
-                attendance_status='registered'
-            )
-            db.add(registration)
-
-        db.commit()
+        # Insert everything with one executemany per table inside a single
+        # transaction instead of flushing ORM objects row by row
+        # Validate the whole batch in one pydantic-core call
+        users = USER_CREATE_LIST_ADAPTER.validate_python(users_data)
+        user_rows = [user.model_dump(exclude={'interests', 'goals'}) for user in users]
+
+        is_sqlite = engine.dialect.name == "sqlite"
+        with engine.connect() as conn:
+            if is_sqlite:
+                # Throwaway data; skip fsyncs for the duration of the load
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                conn.commit()
+
+            with conn.begin():
+                user_ids = conn.execute(
+                    insert(User).returning(User.id, sort_by_parameter_order=True),
+                    user_rows
+                ).scalars().all()
+
+                conn.execute(insert(UserInterest), [
+                    {'user_id': user_id, 'interest': interest, 'proficiency_level': 'advanced'}
+                    for user_id, user in zip(user_ids, users)
+                    for interest in user.interests
+                ])
+
+                conn.execute(insert(UserGoal), [
+                    {'user_id': user_id, 'goal': goal, 'goal_type': 'network'}
+                    for user_id, user in zip(user_ids, users)
+                    for goal in user.goals
+                ])
+
+                event_ids = conn.execute(
+                    insert(Event).returning(Event.id, sort_by_parameter_order=True),
+                    events_data
+                ).scalars().all()
+
+                # Register all users for the first event (AI Conference)
+                # and the first four for the second (Tech Summit)
+                registrations = [
+                    {'event_id': event_ids[0], 'user_id': user_id, 'attendance_status': 'registered'}
+                    for user_id in user_ids
+                ] + [
+                    {'event_id': event_ids[1], 'user_id': user_id, 'attendance_status': 'registered'}
+                    for user_id in user_ids[:4]
+                ]
+                conn.execute(insert(EventAttendee), registrations)
+
+            if is_sqlite:
+                conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
+                conn.commit()
 
         stats = {
-            'users': len(db_users),
-            'events': len(db_events),
-            'interests': sum(len(user_data['interests']) for user_data in users_data),
-            'goals': sum(len(user_data['goals']) for user_data in users_data),
-            'registrations': len(db_users) + 4  # All users in event 1 + 4 users in event 2
+            'users': len(user_ids),
+            'events': len(event_ids),
+            'interests': sum(len(user.interests) for user in users),
+            'goals': sum(len(user.goals) for user in users),
+            'registrations': len(registrations)
         }
 
         logger.info(f"Sample data created successfully: {stats}")
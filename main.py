@@ -10,7 +10,8 @@ from contextlib import asynccontextmanager
 import uvicorn
 import logging
 
-from api.routes import router
+from api.responses import PydanticJSONResponse
+from api.routes import router, linkedin_service
 from database.connection import init_database
 from config.settings import settings
 
@@ -40,6 +41,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Event Networking AI System")
+    linkedin_service.close()
+    await linkedin_service.aclose()
 
 # Create FastAPI application
 app = FastAPI(
@@ -72,6 +75,7 @@ app = FastAPI(
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT",
     },
+    default_response_class=PydanticJSONResponse,
     lifespan=lifespan
 )
 
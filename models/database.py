@@ -6,7 +6,7 @@ These models define the database schema and relationships.
 
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, ForeignKey, 
-    Float, Boolean, UniqueConstraint, Index
+    Float, Boolean, UniqueConstraint, Index, DDL, event
 )
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -29,8 +29,11 @@ class User(Base):
     
     # Professional information
     job_title = Column(String(255), index=True)
-    company = Column(String(255), index=True)
-    industry = Column(String(100), index=True)
+    # No full-column indexes: the partial idx_user_*_nn indexes below serve
+    # equality filters and grouping on non-null values only, which is all the
+    # services run; an IS NULL filter or ORDER BY would need a full index
+    company = Column(String(255))
+    industry = Column(String(100))
     bio = Column(Text)
     experience_years = Column(Integer)
     linkedin_url = Column(String(500))
@@ -49,6 +52,19 @@ class User(Base):
     interests = relationship("UserInterest", back_populates="user", cascade="all, delete-orphan")
     goals = relationship("UserGoal", back_populates="user", cascade="all, delete-orphan")
     
+    # Partial indexes: event analytics only group/aggregate non-null values,
+    # and equality filters on these columns imply NOT NULL, so the NULL-heavy
+    # part of sparse profiles never has to be indexed or scanned
+    __table_args__ = (
+        Index('idx_user_industry_nn', industry,
+              postgresql_where=industry.isnot(None), sqlite_where=industry.isnot(None)),
+        Index('idx_user_company_nn', company,
+              postgresql_where=company.isnot(None), sqlite_where=company.isnot(None)),
+        Index('idx_user_experience_nn', experience_years,
+              postgresql_where=experience_years.isnot(None),
+              sqlite_where=experience_years.isnot(None)),
+    )
+    
     def __repr__(self):
         return f"<User(id={self.id}, name='{self.name}', company='{self.company}')>"
 
@@ -58,7 +74,7 @@ class UserInterest(Base):
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    interest = Column(String(100), nullable=False, index=True)
+    interest = Column(String(100), nullable=False)  # covered by idx_interest_proficiency
     proficiency_level = Column(String(20), default="intermediate")
     category = Column(String(50))
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -71,9 +87,6 @@ class UserInterest(Base):
         UniqueConstraint('user_id', 'interest', name='_user_interest_unique'),
         Index('idx_interest_proficiency', 'interest', 'proficiency_level'),
     )
-    
-    def __repr__(self):
-        return f"<UserInterest(user_id={self.user_id}, interest='{self.interest}')>"
 
 class UserGoal(Base):
     """User networking goals"""
@@ -155,9 +168,6 @@ class EventAttendee(Base):
         UniqueConstraint('event_id', 'user_id', name='_event_user_unique'),
         Index('idx_event_attendance', 'event_id', 'attendance_status'),
     )
-    
-    def __repr__(self):
-        return f"<EventAttendee(event_id={self.event_id}, user_id={self.user_id})>"
 
 # ════════════════════════════════════════════════════════════════════════════════
 # RECOMMENDATION MODELS
@@ -186,7 +196,7 @@ class Recommendation(Base):
     is_active = Column(Boolean, default=True, index=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Constraints and indexes
@@ -195,6 +205,9 @@ class Recommendation(Base):
                         name='_user_recommendation_unique'),
         Index('idx_recommendation_score', 'event_id', 'similarity_score'),
         Index('idx_recommendation_confidence', 'event_id', 'confidence_level'),
+        # Append-only timestamp: BRIN on PostgreSQL, plain B-tree elsewhere
+        Index('idx_recommendation_created_brin', 'created_at',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
     
     def __repr__(self):
@@ -383,17 +396,39 @@ class ApiLog(Base):
     user_agent = Column(Text)
     
     # Timestamps
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Indexes for efficient querying
     __table_args__ = (
         Index('idx_api_log_endpoint_time', 'endpoint', 'timestamp'),
         Index('idx_api_log_status_time', 'status_code', 'timestamp'),
+        # Append-only timestamp: BRIN on PostgreSQL, plain B-tree elsewhere
+        Index('idx_api_log_ts_brin', 'timestamp',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
     
     def __repr__(self):
         return f"<ApiLog(endpoint='{self.endpoint}', status_code={self.status_code})>"
 
+# ════════════════════════════════════════════════════════════════════════════════
+# STORAGE PARAMETERS
+# ════════════════════════════════════════════════════════════════════════════════
+
+# Tables whose rows are rewritten in place (profile_completeness, metrics,
+# cluster_strength). A fillfactor below 100 leaves free space on each page so
+# PostgreSQL can apply HOT updates without touching the indexes.
+UPDATE_HEAVY_FILLFACTOR = 80
+
+for _model in (User, EventMetrics, UserMetrics, NetworkCluster):
+    event.listen(
+        _model.__table__,
+        "after_create",
+        DDL(
+            f"ALTER TABLE {_model.__tablename__} "
+            f"SET (fillfactor = {UPDATE_HEAVY_FILLFACTOR})"
+        ).execute_if(dialect="postgresql")
+    )
+
 # ════════════════════════════════════════════════════════════════════════════════
 # PERFORMANCE INDEXES
 # ════════════════════════════════════════════════════════════════════════════════
@@ -401,31 +436,98 @@ class ApiLog(Base):
 # Additional indexes for performance optimization
 # These are created separately to ensure they're applied after table creation
 
+PERFORMANCE_INDEXES = [
+    # Composite indexes for common query patterns
+    """
+    idx_user_company_industry
+    ON users(company, industry) WHERE is_active = true
+    """,
+    """
+    idx_event_date_active
+    ON events(date, is_active) WHERE is_active = true
+    """,
+    """
+    idx_recommendation_event_score
+    ON recommendations(event_id, similarity_score DESC)
+    WHERE is_active = true
+    """,
+    """
+    idx_user_interests_category
+    ON user_interests(interest, category)
+    """,
+]
+
+# Generated full-text column over the free-text profile fields. It is managed
+# here rather than on the User model because SQLite has no tsvector type;
+# query it with: WHERE search_vec @@ plainto_tsquery('english', :query)
+POSTGRESQL_USER_SEARCH_COLUMN = """
+    ALTER TABLE users ADD COLUMN IF NOT EXISTS search_vec tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('english',
+            coalesce(bio, '') || ' ' || coalesce(job_title, '') || ' ' || coalesce(company, ''))
+    ) STORED
+"""
+
+POSTGRESQL_INDEXES = [
+    # Inverted index for free-text profile search
+    """
+    idx_user_search
+    ON users USING GIN (search_vec)
+    """,
+    # Covering index for "active recommendations for user U at event E by score";
+    # INCLUDE lets the lookup be answered by an index-only scan
+    """
+    idx_rec_user_active
+    ON recommendations(user_id, event_id, similarity_score DESC)
+    INCLUDE (recommended_user_id, reason, confidence_level)
+    WHERE is_active = true
+    """,
+]
+
+# Other dialects have no INCLUDE clause; the same key order still turns the
+# per-user lookup into a range scan read in score order. SQLite only uses a
+# partial index when the predicate matches the query text, and SQLAlchemy
+# renders Boolean comparisons there as "= 1"
+FALLBACK_INDEXES = [
+    """
+    idx_rec_user_active
+    ON recommendations(user_id, event_id, similarity_score DESC)
+    WHERE is_active = 1
+    """,
+]
+
 def create_performance_indexes(engine):
     """Create additional performance indexes"""
     from sqlalchemy import text
     
-    with engine.connect() as conn:
-        # Composite indexes for common query patterns
-        conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_user_company_industry 
-            ON users(company, industry) WHERE is_active = true
-        """))
-        
-        conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_event_date_active 
-            ON events(date, is_active) WHERE is_active = true
-        """))
-        
-        conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_recommendation_event_score 
-            ON recommendations(event_id, similarity_score DESC) 
-            WHERE is_active = true
-        """))
-        
-        conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_user_interests_category 
-            ON user_interests(interest, category)
-        """))
-        
-        conn.commit()
\ No newline at end of file
+    if engine.dialect.name != "postgresql":
+        # SQLite has a single writer and no CONCURRENTLY, so build serially
+        with engine.connect() as conn:
+            for index_sql in PERFORMANCE_INDEXES + FALLBACK_INDEXES:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_sql}"))
+            conn.commit()
+        return
+    
+    import re
+    from collections import defaultdict
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def build_table_indexes(statements):
+        # CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index_sql in statements:
+                conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_sql}"))
+    
+    # The generated column must exist before its GIN index is built
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(POSTGRESQL_USER_SEARCH_COLUMN))
+    
+    # A concurrent build takes a self-conflicting lock on its table, so two
+    # builds on one table would only queue; run tables in parallel and each
+    # table's indexes one after another on a single connection
+    statements_by_table = defaultdict(list)
+    for index_sql in PERFORMANCE_INDEXES + POSTGRESQL_INDEXES:
+        statements_by_table[re.search(r"\bON\s+(\w+)", index_sql).group(1)].append(index_sql)
+    
+    with ThreadPoolExecutor(max_workers=len(statements_by_table)) as executor:
+        list(executor.map(build_table_indexes, statements_by_table.values()))
@@ -4,15 +4,55 @@ Pydantic models for API request/response validation and serialization.
 These schemas define the structure of data exchanged through the API.
 """
 
-from pydantic import BaseModel, Field, EmailStr, validator
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import time
+from pydantic import (
+    AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field, HttpUrl, PlainSerializer,
+    TypeAdapter, UrlConstraints, field_validator
+)
+from typing import Annotated, Generic, List, Literal, Optional, Dict, Any, TypeVar
+from typing_extensions import TypedDict
+from datetime import datetime, timezone
 from enum import Enum
 
+from utils.helpers import validate_email
+
 # ════════════════════════════════════════════════════════════════════════════════
 # BASE MODELS AND ENUMS
 # ════════════════════════════════════════════════════════════════════════════════
 
+class SchemaModel(BaseModel):
+    """
+    Base for all API schemas. Core schemas are built lazily on first use, so
+    processes that import this module but only touch a few models (scripts,
+    workers serving a subset of routes) skip building the rest at boot.
+    """
+    model_config = ConfigDict(defer_build=True)
+
+# Delegates to utils.helpers.validate_email so both share one compiled pattern
+def _check_email(v: str) -> str:
+    if not validate_email(v):
+        raise ValueError('value is not a valid email address')
+    return v
+
+Email = Annotated[str, AfterValidator(_check_email)]
+
+# URL parsing and the http(s) scheme check run in pydantic-core; the value is
+# stored as a plain string and blank input counts as unset
+HttpUrlStr = Annotated[
+    HttpUrl, UrlConstraints(max_length=500), AfterValidator(str), PlainSerializer(str, return_type=str)
+]
+OptionalHttpUrlStr = Annotated[Optional[HttpUrlStr], BeforeValidator(lambda v: v or None)]
+
+# Current UTC time, refreshed at most once per second for bulk validation
+_NOW_CACHE = [0, datetime.min.replace(tzinfo=timezone.utc)]
+
+def _now_utc() -> datetime:
+    t = time.monotonic_ns()
+    if t - _NOW_CACHE[0] > 1_000_000_000:
+        _NOW_CACHE[0] = t
+        _NOW_CACHE[1] = datetime.now(timezone.utc)
+    return _NOW_CACHE[1]
+
 class ProficiencyLevel(str, Enum):
     """User proficiency levels for interests"""
     BEGINNER = "beginner"
@@ -41,6 +81,7 @@ class ClusteringAlgorithm(str, Enum):
     LOUVAIN = "louvain"
     GIRVAN_NEWMAN = "girvan_newman"
     LABEL_PROPAGATION = "label_propagation"
+    NX_LEGACY = "nx_legacy"  # NetworkX greedy modularity
 
 class AttendanceStatus(str, Enum):
     """Event attendance status"""
@@ -49,42 +90,42 @@ class AttendanceStatus(str, Enum):
     ATTENDED = "attended"
     NO_SHOW = "no_show"
 
+# Literal twins of the enums above, used on response models the engines build
+# on every request; pydantic-core checks these with a hashed membership test
+ConfidenceLevelLit = Literal["very_high", "high", "medium", "low"]
+ClusteringAlgorithmLit = Literal["louvain", "girvan_newman", "label_propagation", "nx_legacy"]
+SimilarityTypeLit = Literal["cosine_similarity", "jaccard"]
+
 # ════════════════════════════════════════════════════════════════════════════════
 # USER MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class UserInterestBase(BaseModel):
+class UserInterestBase(SchemaModel):
     """Base model for user interests"""
     interest: str = Field(..., min_length=1, max_length=100)
     proficiency_level: ProficiencyLevel = ProficiencyLevel.INTERMEDIATE
     category: Optional[str] = Field(None, max_length=50)
 
-class UserGoalBase(BaseModel):
+class UserGoalBase(SchemaModel):
     """Base model for user goals"""
     goal: str = Field(..., min_length=1, max_length=255)
     goal_type: GoalType = GoalType.NETWORK
     priority: int = Field(1, ge=1, le=3)
 
-class UserCreate(BaseModel):
+class UserCreate(SchemaModel):
     """Schema for creating a new user"""
     name: str = Field(..., min_length=1, max_length=255)
-    email: EmailStr
+    email: Email
     job_title: Optional[str] = Field(None, max_length=255)
     company: Optional[str] = Field(None, max_length=255)
     industry: Optional[str] = Field(None, max_length=100)
     bio: Optional[str] = Field(None, max_length=2000)
     experience_years: Optional[int] = Field(None, ge=0, le=60)
-    linkedin_url: Optional[str] = Field(None, max_length=500)
-    interests: List[str] = Field(default_factory=list, max_items=20)
-    goals: List[str] = Field(default_factory=list, max_items=10)
-    
-    @validator('linkedin_url')
-    def validate_linkedin_url(cls, v):
-        if v and not v.startswith(('http://', 'https://')):
-            raise ValueError('LinkedIn URL must be a valid URL')
-        return v
+    linkedin_url: OptionalHttpUrlStr = None
+    interests: List[str] = Field(default_factory=list, max_length=20)
+    goals: List[str] = Field(default_factory=list, max_length=10)
 
-class UserUpdate(BaseModel):
+class UserUpdate(SchemaModel):
     """Schema for updating user information"""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     job_title: Optional[str] = Field(None, max_length=255)
@@ -93,10 +134,10 @@ class UserUpdate(BaseModel):
     bio: Optional[str] = Field(None, max_length=2000)
     experience_years: Optional[int] = Field(None, ge=0, le=60)
     linkedin_url: Optional[str] = Field(None, max_length=500)
-    interests: Optional[List[str]] = Field(None, max_items=20)
-    goals: Optional[List[str]] = Field(None, max_items=10)
+    interests: Optional[List[str]] = Field(None, max_length=20)
+    goals: Optional[List[str]] = Field(None, max_length=10)
 
-class UserProfile(BaseModel):
+class UserProfile(SchemaModel):
     """Complete user profile schema"""
     id: int
     name: str
@@ -113,10 +154,9 @@ class UserProfile(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-class UserSummary(BaseModel):
+class UserSummary(SchemaModel):
     """Lightweight user summary for listings"""
     id: int
     name: str
@@ -124,11 +164,13 @@ class UserSummary(BaseModel):
     company: Optional[str] = None
     industry: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True)
+
 # ════════════════════════════════════════════════════════════════════════════════
 # EVENT MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class EventCreate(BaseModel):
+class EventCreate(SchemaModel):
     """Schema for creating a new event"""
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = Field(None, max_length=2000)
@@ -140,13 +182,17 @@ class EventCreate(BaseModel):
     max_attendees: Optional[int] = Field(None, ge=1, le=10000)
     event_type: Optional[str] = Field("conference", max_length=50)
     
-    @validator('date')
+    @field_validator('date')
+    @classmethod
     def validate_future_date(cls, v):
-        if v <= datetime.utcnow():
+        now = _now_utc()
+        if v.tzinfo is None:
+            now = now.replace(tzinfo=None)
+        if v <= now:
             raise ValueError('Event date must be in the future')
         return v
 
-class EventUpdate(BaseModel):
+class EventUpdate(SchemaModel):
     """Schema for updating event information"""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = Field(None, max_length=2000)
@@ -159,7 +205,7 @@ class EventUpdate(BaseModel):
     event_type: Optional[str] = Field(None, max_length=50)
     is_active: Optional[bool] = None
 
-class EventInfo(BaseModel):
+class EventInfo(SchemaModel):
     """Complete event information schema"""
     id: int
     name: str
@@ -177,10 +223,9 @@ class EventInfo(BaseModel):
     is_upcoming: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-class EventSummary(BaseModel):
+class EventSummary(SchemaModel):
     """Lightweight event summary for listings"""
     id: int
     name: str
@@ -189,23 +234,25 @@ class EventSummary(BaseModel):
     attendee_count: int
     is_active: bool
 
+    model_config = ConfigDict(frozen=True)
+
 # ════════════════════════════════════════════════════════════════════════════════
 # RECOMMENDATION MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class RecommendationItem(BaseModel):
+class RecommendationItem(SchemaModel):
     """Individual recommendation item"""
     recommended_user_id: int
     recommended_user_name: str
     recommended_user_company: Optional[str] = None
     recommended_user_title: Optional[str] = None
     similarity_score: float = Field(..., ge=0, le=1)
-    confidence_level: ConfidenceLevel
+    confidence_level: ConfidenceLevelLit
     reason: str
     mutual_interests: List[str] = Field(default_factory=list)
     complementary_goals: List[str] = Field(default_factory=list)
 
-class RecommendationResponse(BaseModel):
+class RecommendationResponse(SchemaModel):
     """Response containing recommendations for a single user"""
     user_id: int
     user_name: str
@@ -213,27 +260,34 @@ class RecommendationResponse(BaseModel):
     recommended_users: List[RecommendationItem] = Field(default_factory=list)
     generated_at: datetime
 
-class RecommendationRequest(BaseModel):
+class RecommendationRequest(SchemaModel):
     """Request schema for generating recommendations"""
     event_id: int
     user_id: Optional[int] = None
     max_recommendations: int = Field(10, ge=1, le=20)
     min_similarity_threshold: Optional[float] = Field(None, ge=0, le=1)
 
-class BulkRecommendationResponse(BaseModel):
+class AlgorithmInfo(TypedDict, total=False):
+    """Metadata about the algorithm behind a bulk recommendation run"""
+    algorithm: str
+    version: str
+    features_used: List[str]
+    status: str
+
+class BulkRecommendationResponse(SchemaModel):
     """Response containing recommendations for all users at an event"""
     event_id: int
     event_name: str
     recommendations: List[RecommendationResponse]
     total_users: int
     generation_time_seconds: float
-    algorithm_info: Dict[str, Any]
+    algorithm_info: AlgorithmInfo
 
 # ════════════════════════════════════════════════════════════════════════════════
 # CLUSTERING AND NETWORK MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class ClusterMember(BaseModel):
+class ClusterMember(SchemaModel):
     """Member of a cluster in network analysis"""
     user_id: int
     name: str
@@ -242,7 +296,9 @@ class ClusterMember(BaseModel):
     industry: Optional[str] = None
     degree: int  # Number of connections in the network
 
-class Cluster(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+class Cluster(SchemaModel):
     """Cluster of similar users"""
     cluster_id: int
     size: int
@@ -251,23 +307,33 @@ class Cluster(BaseModel):
     common_interests: List[str] = Field(default_factory=list)
     members: List[ClusterMember]
 
-class ClusterAnalysisRequest(BaseModel):
+class ClusterAnalysisRequest(SchemaModel):
     """Request for cluster analysis"""
     event_id: int
     algorithm: ClusteringAlgorithm = ClusteringAlgorithm.LOUVAIN
     min_cluster_size: int = Field(2, ge=2, le=50)
     similarity_threshold: Optional[float] = Field(None, ge=0, le=1)
 
-class ClusterAnalysisResponse(BaseModel):
+class ClusterStats(TypedDict, total=False):
+    """Summary statistics for a cluster analysis run"""
+    total_nodes: int
+    total_edges: int
+    num_clusters: int
+    modularity: float
+    avg_cluster_size: float
+    largest_cluster_size: int
+    smallest_cluster_size: int
+
+class ClusterAnalysisResponse(SchemaModel):
     """Response containing cluster analysis results"""
     event_id: int
     event_name: str
-    algorithm_used: ClusteringAlgorithm
+    algorithm_used: ClusteringAlgorithmLit
     clusters: List[Cluster]
-    cluster_stats: Dict[str, Any]
+    cluster_stats: ClusterStats
     analysis_timestamp: datetime
 
-class NetworkNode(BaseModel):
+class NetworkNode(SchemaModel):
     """Node in the network visualization"""
     id: int
     name: str
@@ -279,14 +345,18 @@ class NetworkNode(BaseModel):
     size: int  # Visual size for rendering
     color: str  # Hex color code
 
-class NetworkEdge(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+class NetworkEdge(SchemaModel):
     """Edge in the network visualization"""
     source: int
     target: int
     weight: float = Field(..., ge=0, le=1)
-    similarity_type: str = "cosine_similarity"
+    similarity_type: SimilarityTypeLit = "cosine_similarity"
+
+    model_config = ConfigDict(frozen=True)
 
-class NetworkData(BaseModel):
+class NetworkData(SchemaModel):
     """Complete network data for visualization"""
     event_id: int
     nodes: List[NetworkNode]
@@ -298,7 +368,7 @@ class NetworkData(BaseModel):
 # ANALYTICS MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class EventAnalytics(BaseModel):
+class EventAnalytics(SchemaModel):
     """Analytics data for an event"""
     event_id: int
     event_name: str
@@ -309,7 +379,7 @@ class EventAnalytics(BaseModel):
     experience_stats: Dict[str, float]
     top_interests: Dict[str, int]
 
-class UserAnalytics(BaseModel):
+class UserAnalytics(SchemaModel):
     """Analytics data for a user profile"""
     user_id: int
     profile_completeness: float
@@ -318,7 +388,7 @@ class UserAnalytics(BaseModel):
     goals_count: int
     recommendations: List[str]
 
-class RecommendationAnalytics(BaseModel):
+class RecommendationAnalytics(SchemaModel):
     """Analytics for recommendation quality and performance"""
     event_id: int
     total_recommendations: int
@@ -330,7 +400,7 @@ class RecommendationAnalytics(BaseModel):
 # SYSTEM AND UTILITY MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class HealthCheck(BaseModel):
+class HealthCheck(SchemaModel):
     """System health check response"""
     status: str
     service: str
@@ -339,25 +409,22 @@ class HealthCheck(BaseModel):
     ml_engine_status: str
     dependencies_status: Dict[str, str]
 
-class SuccessResponse(BaseModel):
+class SuccessResponse(SchemaModel):
     """Generic success response"""
     message: str
     success: bool = True
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(SchemaModel):
     """Generic error response"""
     error: str
     detail: Optional[str] = None
     success: bool = False
 
-class PaginationParams(BaseModel):
-    """Pagination parameters"""
-    page: int = Field(1, ge=1)
-    size: int = Field(10, ge=1, le=100)
+T = TypeVar("T")
 
-class PaginatedResponse(BaseModel):
-    """Generic paginated response wrapper"""
-    items: List[Any]
+class PaginatedResponse(SchemaModel, Generic[T]):
+    """Generic paginated response wrapper, e.g. PaginatedResponse[UserSummary]"""
+    items: List[T]
     total: int
     page: int
     size: int
@@ -373,7 +440,7 @@ class ExportFormat(str, Enum):
     CSV = "csv"
     XLSX = "xlsx"
 
-class ExportRequest(BaseModel):
+class ExportRequest(SchemaModel):
     """Request for data export"""
     event_id: int
     format: ExportFormat = ExportFormat.JSON
@@ -381,7 +448,7 @@ class ExportRequest(BaseModel):
     include_clusters: bool = True
     include_analytics: bool = False
 
-class ExportResponse(BaseModel):
+class ExportResponse(SchemaModel):
     """Response for data export"""
     event_id: int
     format: ExportFormat
@@ -394,16 +461,25 @@ class ExportResponse(BaseModel):
 # CONFIGURATION MODELS
 # ════════════════════════════════════════════════════════════════════════════════
 
-class SystemConfig(BaseModel):
+class SystemConfig(SchemaModel):
     """System configuration information"""
     version: str
     algorithms: Dict[str, Any]
     limits: Dict[str, int]
     features: List[str]
 
-class AlgorithmConfig(BaseModel):
+class AlgorithmConfig(SchemaModel):
     """Configuration for recommendation algorithms"""
     min_similarity_threshold: float = Field(0.1, ge=0, le=1)
     max_recommendations: int = Field(10, ge=1, le=50)
     tfidf_max_features: int = Field(1000, ge=100, le=10000)
-    clustering_algorithm: ClusteringAlgorithm = ClusteringAlgorithm.LOUVAIN
\ No newline at end of file
+    clustering_algorithm: ClusteringAlgorithm = ClusteringAlgorithm.LOUVAIN
+
+# ════════════════════════════════════════════════════════════════════════════════
+# TYPE ADAPTERS
+# ════════════════════════════════════════════════════════════════════════════════
+
+# Built once at import and reused so hot endpoints can serialize straight to
+# JSON bytes in pydantic-core, bypassing FastAPI's jsonable_encoder walk
+BULK_RECOMMENDATION_ADAPTER = TypeAdapter(BulkRecommendationResponse)
+USER_CREATE_LIST_ADAPTER = TypeAdapter(List[UserCreate])
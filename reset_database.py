@@ -3,31 +3,93 @@ Reset Database Script
 Drops existing tables and recreates them with the latest schema
 """
 
+import hashlib
 import os
 import logging
 from pathlib import Path
+from typing import Optional
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def _database_file() -> Optional[Path]:
+    """The configured SQLite database file, resolved the way SQLite opens it"""
+    from sqlalchemy.engine import make_url
+    from config.settings import settings
+
+    url = make_url(settings.database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return Path(url.database).resolve()
+
+
+def _schema_hash_file(db_file: Path) -> Path:
+    """Schema hash sidecar; it lives and moves with the database it describes"""
+    return db_file.with_name(f"{db_file.name}.schema_hash")
+
+
+def _schema_hash(database_url: str) -> str:
+    """Hash of the database URL plus the CREATE TABLE/INDEX DDL for every model"""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex, CreateTable
+    from models.database import Base
+
+    dialect = sqlite.dialect()
+    ddl = [database_url]
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(str(CreateIndex(index).compile(dialect=dialect))
+                   for index in sorted(table.indexes, key=lambda i: i.name))
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+
+def _truncate_tables():
+    """Empty every table in one transaction, children before parents"""
+    from sqlalchemy import delete
+    from database.connection import engine
+    from models.database import Base
+
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(delete(table))
+
+
 def reset_database():
-    """Reset the database by deleting the file and reinitializing"""
+    """
+    Reset the database. When the schema is unchanged since the last reset the
+    existing file is emptied in place; otherwise it is deleted and recreated.
+    """
     try:
-        # Database file path
-        db_file = Path("event_networking.db")
-        
-        # Delete existing database file if it exists
-        if db_file.exists():
+        from config.settings import settings
+
+        db_file = _database_file()
+        hash_file = _schema_hash_file(db_file) if db_file else None
+        schema_hash = _schema_hash(settings.database_url)
+        schema_unchanged = (
+            db_file is not None
+            and db_file.exists()
+            and hash_file.exists()
+            and hash_file.read_text().strip() == schema_hash
+        )
+
+        if schema_unchanged:
+            logger.info("🧹 Schema unchanged, clearing existing tables...")
+            _truncate_tables()
+        elif db_file is not None and db_file.exists():
+            # Delete existing database file
             os.remove(db_file)
             logger.info(f"✅ Deleted existing database: {db_file}")
         else:
             logger.info("📄 No existing database file found")
         
-        # Import and initialize database
+        # Import and initialize database (re-seeds system config after a truncate)
         from database.connection import init_database
-        logger.info("🔄 Initializing fresh database...")
+        logger.info("🔄 Initializing database...")
         init_database()
+        if hash_file is not None:
+            hash_file.write_text(schema_hash)
         logger.info("✅ Database reset completed successfully!")
         
         # Create sample data
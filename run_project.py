@@ -4,6 +4,7 @@ Automated setup, database initialization, and server startup
 """
 
 import subprocess
+import shlex
 import sys
 import os
 import logging
@@ -16,8 +17,10 @@ logger = logging.getLogger(__name__)
 def run_command(command, description):
     """Run a command and handle errors"""
     logger.info(f"Running: {description}")
+    if isinstance(command, str):
+        command = shlex.split(command)
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = subprocess.run(command, capture_output=True, text=True)
         if result.returncode != 0:
             logger.error(f"Error in {description}: {result.stderr}")
             return False
@@ -40,7 +43,8 @@ def setup_project():
     logger.info(f"✅ Python version: {sys.version}")
 
     # Install dependencies
-    if not run_command("pip install -r requirements.txt", "Installing dependencies"):
+    if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+                       "Installing dependencies"):
         return False
 
     # Initialize database and create sample data
@@ -61,9 +65,10 @@ def setup_project():
         logger.error(f"Database setup error: {e}")
         return False
 
-    # Run tests
+    # Run tests in-process instead of booting a second interpreter
     logger.info("Running system tests...")
-    if not run_command("python -m pytest tests/test_system.py -v", "Running tests"):
+    import pytest
+    if pytest.main(["tests/test_system.py", "-v"]) != 0:
         logger.warning("Some tests failed, but continuing with startup")
 
     logger.info("🎉 Setup completed successfully!")
@@ -78,8 +83,19 @@ def start_server():
     logger.info("Health Check: http://localhost:8000/health")
     logger.info("Press Ctrl+C to stop the server")
 
+    import uvicorn
+    from config.settings import settings
+
     try:
-        os.system("python main.py")
+        # Reload mode is single-process; use one worker per core otherwise
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=settings.debug,
+            workers=None if settings.debug else os.cpu_count(),
+            log_level="info"
+        )
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
 
@@ -4,20 +4,37 @@ Community detection and network analysis for event attendee visualization
 """
 
 import networkx as nx
-import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional
+from scipy import sparse
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 import logging
+from collections import Counter
 from datetime import datetime
 
+from config.settings import settings
+from database.cache import event_cache_key, event_graph_cache, get_user_snapshots
 from models.database import User, Event, EventAttendee
-from models.schemas import ClusterAnalysisResponse, Cluster, ClusterMember, NetworkData, NetworkNode, NetworkEdge
+from models.schemas import (
+    ClusterAnalysisResponse, Cluster, ClusterMember, ClusterStats, NetworkData, NetworkNode, NetworkEdge
+)
 from services.recommendation_engine import RecommendationEngine
 from utils.helpers import generate_color_palette
 
+# Optional C-backed community detection; falls back to NetworkX's Louvain
+try:
+    import igraph as ig
+    import leidenalg
+except ImportError:
+    ig = leidenalg = None
+
+# Optional GPU backend; NetworkX dispatches to it per call with backend="cugraph"
+CUGRAPH_AVAILABLE = "cugraph" in nx.utils.backends.backends
+
 logger = logging.getLogger(__name__)
 
+COMMUNITY_SEED = 42
+
 
 class ClusteringService:
     """Network clustering service for community detection"""
@@ -26,7 +43,11 @@ class ClusteringService:
         self.recommendation_engine = RecommendationEngine()
 
     def create_network_graph(self, db: Session, event_id: int) -> nx.Graph:
-        """Create a NetworkX graph from event attendees"""
+        """
+        Create a NetworkX graph from event attendees.
+        Nodes are dense row indices 0..N-1; G.graph['user_ids'] maps them back
+        to user ids, which only happens when results are emitted.
+        """
         try:
             # Get attendee data
             df = self.recommendation_engine.get_event_attendees_data(db, event_id)
@@ -34,32 +55,29 @@ class ClusteringService:
             if df.empty or len(df) < 2:
                 return nx.Graph()
 
-            # Create graph
-            G = nx.Graph()
-
-            # Add nodes
-            for _, user in df.iterrows():
-                G.add_node(
-                    user['user_id'],
-                    name=user['name'],
-                    company=user['company'],
-                    industry=user['industry'],
-                    job_title=user['job_title']
+            # Sparse features, keeping only similarities above the edge
+            # threshold, so no dense N x N matrix is ever built
+            similarity_threshold = 0.3
+            features = self.recommendation_engine.create_user_features(df, as_sparse=True)
+            if features.shape[0] > 0:
+                similarity_matrix = self.recommendation_engine.calculate_similarity_matrix(
+                    features, threshold=similarity_threshold
                 )
-
-            # Create features and similarity matrix
-            features = self.recommendation_engine.create_user_features(df)
-            if features.size > 0:
-                similarity_matrix = self.recommendation_engine.calculate_similarity_matrix(features)
-
-                # Add edges based on similarity threshold
-                similarity_threshold = 0.3
-                for i in range(len(df)):
-                    for j in range(i + 1, len(df)):
-                        if similarity_matrix[i, j] > similarity_threshold:
-                            user1_id = df.iloc[i]['user_id']
-                            user2_id = df.iloc[j]['user_id']
-                            G.add_edge(user1_id, user2_id, weight=similarity_matrix[i, j])
+                # Upper triangle drops self-similarity and duplicate pairs
+                adjacency = sparse.triu(similarity_matrix, k=1, format='csr')
+            else:
+                adjacency = sparse.csr_matrix((len(df), len(df)))
+
+            # Build the whole graph from the adjacency in one call and attach
+            # profile attributes by row index
+            G = nx.from_scipy_sparse_array(adjacency, edge_attribute='weight')
+            G.graph['user_ids'] = df['user_id'].to_numpy(dtype=np.int64)
+            # Edge count is known from the build; NetworkX would re-sum degrees
+            G.graph['num_edges'] = adjacency.nnz
+            nx.set_node_attributes(
+                G,
+                dict(enumerate(df[['name', 'company', 'industry', 'job_title']].to_dict('records')))
+            )
 
             return G
 
@@ -67,21 +85,35 @@ class ClusteringService:
             logger.error(f"Error creating network graph: {str(e)}")
             return nx.Graph()
 
-    def detect_communities(self, G: nx.Graph, algorithm: str = "louvain") -> Dict[int, int]:
-        """Detect communities using specified algorithm"""
+    def detect_communities(self, G: nx.Graph, algorithm: str = "louvain",
+                           fast_approx: bool = False) -> Dict[int, int]:
+        """
+        Detect communities using specified algorithm. fast_approx makes the
+        default Louvain stop after its first level (no graph aggregation)
+        """
         try:
-            if len(G.nodes()) < 3:
+            if G.number_of_nodes() < 3:
                 return {node: 0 for node in G.nodes()}
 
-            if algorithm == "louvain":
+            # Without edges every algorithm ends in singletons; skip the setup
+            if G.graph.get('num_edges', G.number_of_edges()) == 0:
+                return {node: community_id for community_id, node in enumerate(G.nodes())}
+
+            if algorithm == "nx_legacy":
+                # Clauset-Newman-Moore greedy merging, kept for comparison only
                 communities = nx.algorithms.community.greedy_modularity_communities(G)
             elif algorithm == "girvan_newman":
-                communities = list(nx.algorithms.community.girvan_newman(G))
-                communities = communities[0] if communities else [set(G.nodes())]
+                # Only the first split is used; consuming the whole generator
+                # would run edge betweenness all the way down to singletons
+                communities = next(nx.algorithms.community.girvan_newman(G), None) or [set(G.nodes())]
             elif algorithm == "label_propagation":
                 communities = nx.algorithms.community.label_propagation_communities(G)
             else:
-                communities = nx.algorithms.community.greedy_modularity_communities(G)
+                # "louvain" and unrecognised values use the delta-modularity
+                # local-moving methods, never the greedy full-modularity one
+                if fast_approx:
+                    return self._single_level_louvain(G)
+                return self._louvain_communities(G)
 
             # Create mapping
             community_mapping = {}
@@ -95,20 +127,105 @@ class ClusteringService:
             logger.error(f"Error in community detection: {str(e)}")
             return {node: 0 for node in G.nodes()}
 
+    def _default_community_method(self, G: nx.Graph) -> str:
+        """Which backend the default "louvain" detection uses for G"""
+        if CUGRAPH_AVAILABLE and G.number_of_nodes() >= settings.gpu_community_min_nodes:
+            return "cugraph"
+        return "leiden" if leidenalg is not None else "louvain"
+
+    def _louvain_communities(self, G: nx.Graph) -> Dict[int, int]:
+        """Default community detection: GPU Louvain, Leiden, or NetworkX Louvain"""
+        method = self._default_community_method(G)
+        communities = None
+
+        if method == "cugraph":
+            try:
+                communities = nx.algorithms.community.louvain_communities(
+                    G, weight='weight', seed=COMMUNITY_SEED, backend="cugraph"
+                )
+            except Exception as e:
+                logger.warning(f"cuGraph community detection failed, using CPU: {str(e)}")
+                method = "leiden" if leidenalg is not None else "louvain"
+
+        if method == "leiden":
+            return self._leiden_communities(G)
+        if communities is None:
+            communities = nx.algorithms.community.louvain_communities(
+                G, weight='weight', seed=COMMUNITY_SEED
+            )
+
+        return {node: community_id
+                for community_id, community in enumerate(communities)
+                for node in community}
+
+    def _single_level_louvain(self, G: nx.Graph) -> Dict[int, int]:
+        """First Louvain level only: one local-moving pass, no aggregation"""
+        partitions = nx.algorithms.community.louvain_partitions(
+            G, weight='weight', seed=COMMUNITY_SEED
+        )
+        communities = next(partitions, None) or [set(G.nodes())]
+        return {node: community_id
+                for community_id, community in enumerate(communities)
+                for node in community}
+
+    def _leiden_communities(self, G: nx.Graph) -> Dict[int, int]:
+        """Leiden community detection on an igraph copy of G (dense 0..N-1 nodes)"""
+        edges = list(G.edges(data='weight', default=1.0))
+
+        ig_graph = ig.Graph(n=G.number_of_nodes(), edges=[(u, v) for u, v, _ in edges])
+        partition = leidenalg.find_partition(
+            ig_graph,
+            leidenalg.ModularityVertexPartition,
+            weights=[w for _, _, w in edges],
+            seed=COMMUNITY_SEED
+        )
+        return dict(enumerate(partition.membership))
+
+    def _get_graph_and_communities(self, db: Session, event_id: int,
+                                   algorithm: str = "louvain",
+                                   fast_approx: bool = False) -> Tuple[nx.Graph, np.ndarray]:
+        """
+        Build the event graph and its community membership array (cluster id
+        per node index), reusing a recent result for the same event and
+        algorithm (see database.cache.event_graph_cache)
+        """
+        key = event_cache_key(db, event_id, algorithm, fast_approx)
+        cached = event_graph_cache.get(key)
+        if cached is not None:
+            return cached
+
+        G = self.create_network_graph(db, event_id)
+        community_mapping = (
+            self.detect_communities(G, algorithm, fast_approx) if G.number_of_nodes() > 0 else {}
+        )
+        membership = np.fromiter(
+            (community_mapping.get(node, 0) for node in range(G.number_of_nodes())),
+            dtype=np.int32, count=G.number_of_nodes()
+        )
+
+        event_graph_cache.put(key, (G, membership))
+        return G, membership
+
     def analyze_clusters(self, db: Session, event_id: int,
                          algorithm: str = "louvain",
-                         min_cluster_size: int = 2) -> ClusterAnalysisResponse:
-        """Perform comprehensive cluster analysis"""
+                         min_cluster_size: int = 2,
+                         fast_approx: bool = False) -> ClusterAnalysisResponse:
+        """
+        Perform comprehensive cluster analysis. fast_approx trades partition
+        quality for speed (single-level Louvain); meant for small test graphs
+        """
         try:
             # Get event
             event = db.query(Event).filter(Event.id == event_id).first()
             if not event:
                 raise ValueError(f"Event {event_id} not found")
 
-            # Create network graph
-            G = self.create_network_graph(db, event_id)
+            # Create network graph and detect communities
+            G, membership = self._get_graph_and_communities(
+                db, event_id, algorithm, fast_approx
+            )
 
-            if len(G.nodes()) == 0:
+            if G.number_of_nodes() == 0:
                 return ClusterAnalysisResponse(
                     event_id=event_id,
                     event_name=event.name,
@@ -123,14 +240,11 @@ class ClusteringService:
                     analysis_timestamp=datetime.now()
                 )
 
-            # Detect communities
-            community_mapping = self.detect_communities(G, algorithm)
-
             # Create clusters
-            clusters = self._create_clusters(db, G, community_mapping, min_cluster_size)
+            clusters = self._create_clusters(db, G, membership, min_cluster_size)
 
             # Calculate statistics
-            cluster_stats = self._calculate_cluster_stats(G, community_mapping)
+            cluster_stats = self._calculate_cluster_stats(G, membership)
 
             return ClusterAnalysisResponse(
                 event_id=event_id,
@@ -146,46 +260,52 @@ class ClusteringService:
             raise
 
     def _create_clusters(self, db: Session, G: nx.Graph,
-                         community_mapping: Dict[int, int],
+                         membership: np.ndarray,
                          min_cluster_size: int) -> List[Cluster]:
-        """Create cluster objects from community mapping"""
-        clusters_dict = {}
-
-        for user_id, cluster_id in community_mapping.items():
-            if cluster_id not in clusters_dict:
-                clusters_dict[cluster_id] = {
-                    "members": [],
-                    "industries": []
-                }
-
-            # Get user info
-            user = db.query(User).filter(User.id == user_id).first()
-            if user:
-                member = ClusterMember(
-                    user_id=user_id,
-                    name=user.name,
-                    company=user.company,
-                    job_title=user.job_title,
-                    industry=user.industry,
-                    degree=G.degree(user_id) if user_id in G.nodes else 0
-                )
+        """Create cluster objects from the community membership array"""
+        user_ids = G.graph['user_ids'].tolist()
+        users = get_user_snapshots(db, user_ids)
+        degrees = [degree for _, degree in G.degree()]
+
+        # Group node indices by cluster with one stable sort: members keep node
+        # order, and clusters are emitted in order of first appearance
+        order = np.argsort(membership, kind='stable')
+        cluster_ids, starts = np.unique(membership[order], return_index=True)
+        groups = sorted(zip(cluster_ids.tolist(), np.split(order, starts[1:])),
+                        key=lambda group: group[1][0])
 
-                clusters_dict[cluster_id]["members"].append(member)
-                if user.industry:
-                    clusters_dict[cluster_id]["industries"].append(user.industry)
-
-        # Create final clusters
         clusters = []
-        for cluster_id, data in clusters_dict.items():
-            if len(data["members"]) >= min_cluster_size:
+        for cluster_id, nodes in groups:
+            # Members can only be dropped below, so undersized groups are skipped
+            if len(nodes) < min_cluster_size:
+                continue
+
+            members = []
+            industries = Counter()
+            for node in nodes.tolist():
+                # Get user info; members are built from trusted rows, so skip validation
+                user = users.get(user_ids[node])
+                if user:
+                    members.append(ClusterMember.model_construct(
+                        user_id=user_ids[node],
+                        name=user.name,
+                        company=user.company,
+                        job_title=user.job_title,
+                        industry=user.industry,
+                        degree=degrees[node]
+                    ))
+                    if user.industry:
+                        industries[user.industry] += 1
+
+            if len(members) >= min_cluster_size:
                 # Find dominant industry
-                industry_counts = pd.Series(data["industries"]).value_counts()
-                dominant_industry = industry_counts.index[0] if len(industry_counts) > 0 else None
+                industry_counts = industries.most_common(1)
+                dominant_industry = industry_counts[0][0] if industry_counts else None
 
                 cluster = Cluster(
                     cluster_id=cluster_id,
-                    size=len(data["members"]),
-                    members=data["members"],
+                    size=len(members),
+                    members=members,
                     dominant_industry=dominant_industry,
                     cluster_strength=0.75,  # Simplified calculation
                     common_interests=[]
@@ -194,39 +314,38 @@ class ClusteringService:
 
         return clusters
 
-    def _calculate_cluster_stats(self, G: nx.Graph, community_mapping: Dict[int, int]) -> Dict:
+    def _calculate_cluster_stats(self, G: nx.Graph, membership: np.ndarray) -> ClusterStats:
         """Calculate comprehensive cluster statistics"""
         try:
-            num_nodes = len(G.nodes())
-            num_edges = len(G.edges())
-            num_clusters = len(set(community_mapping.values()))
-
-            # Calculate modularity
-            communities = []
-            cluster_dict = {}
-            for user_id, cluster_id in community_mapping.items():
-                if cluster_id not in cluster_dict:
-                    cluster_dict[cluster_id] = set()
-                cluster_dict[cluster_id].add(user_id)
-
-            communities = list(cluster_dict.values())
+            num_nodes = G.number_of_nodes()
+            num_edges = G.graph.get('num_edges', G.number_of_edges())
+
+            # Cluster sizes straight from the membership array; ids may have gaps
+            cluster_sizes = np.bincount(membership) if membership.size else membership
+            cluster_sizes = cluster_sizes[cluster_sizes > 0]
+            num_clusters = int(cluster_sizes.size)
+            has_clusters = num_clusters > 0
+
+            # Node sets per cluster for modularity: sort indices by cluster
+            # and split at the cluster boundaries
+            order = np.argsort(membership, kind='stable')
+            communities = [
+                set(chunk.tolist())
+                for chunk in np.split(order, np.cumsum(cluster_sizes)[:-1])
+            ] if has_clusters else []
             modularity = 0.0
-            if len(communities) > 1:
-                try:
-                    modularity = nx.algorithms.community.modularity(G, communities)
-                except:
-                    modularity = 0.0
-
-            cluster_sizes = [len(cluster) for cluster in communities]
+            # Modularity is undefined without edges (NetworkX divides by zero)
+            if len(communities) > 1 and num_edges > 0:
+                modularity = nx.algorithms.community.modularity(G, communities)
 
             return {
                 "total_nodes": num_nodes,
                 "total_edges": num_edges,
                 "num_clusters": num_clusters,
                 "modularity": round(modularity, 3),
-                "avg_cluster_size": round(np.mean(cluster_sizes), 2) if cluster_sizes else 0,
-                "largest_cluster_size": max(cluster_sizes) if cluster_sizes else 0,
-                "smallest_cluster_size": min(cluster_sizes) if cluster_sizes else 0
+                "avg_cluster_size": round(float(cluster_sizes.mean()), 2) if has_clusters else 0,
+                "largest_cluster_size": int(cluster_sizes.max()) if has_clusters else 0,
+                "smallest_cluster_size": int(cluster_sizes.min()) if has_clusters else 0
             }
 
         except Exception as e:
@@ -236,10 +355,10 @@ class ClusteringService:
     def export_network_for_visualization(self, db: Session, event_id: int) -> NetworkData:
         """Export network data for visualization tools"""
         try:
-            # Create network graph
-            G = self.create_network_graph(db, event_id)
+            # Create network graph and detect communities for coloring
+            G, membership = self._get_graph_and_communities(db, event_id)
 
-            if len(G.nodes()) == 0:
+            if G.number_of_nodes() == 0:
                 return NetworkData(
                     event_id=event_id,
                     nodes=[],
@@ -248,47 +367,47 @@ class ClusteringService:
                     generated_at=datetime.now()
                 )
 
-            # Detect communities for coloring
-            community_mapping = self.detect_communities(G)
-            colors = generate_color_palette(len(set(community_mapping.values())))
+            num_clusters = len(np.unique(membership))
+            colors = generate_color_palette(num_clusters)
 
-            # Create nodes
+            # Node indices are mapped back to user ids only here, on emission.
+            # Nodes and edges come straight from the graph, so build them without
+            # validation; NetworkData accepts the instances as-is
             nodes = []
-            for node_id in G.nodes():
-                user = db.query(User).filter(User.id == node_id).first()
+            user_ids = G.graph['user_ids'].tolist()
+            users = get_user_snapshots(db, user_ids)
+            degrees = [degree for _, degree in G.degree()]
+            for node_id, (user_id, cluster_id) in enumerate(zip(user_ids, membership.tolist())):
+                user = users.get(user_id)
                 if user:
-                    cluster_id = community_mapping.get(node_id, 0)
-
-                    node = NetworkNode(
-                        id=node_id,
+                    nodes.append(NetworkNode.model_construct(
+                        id=user_id,
                         name=user.name,
                         company=user.company,
                         industry=user.industry,
                         job_title=user.job_title,
                         cluster=cluster_id,
-                        degree=G.degree(node_id),
-                        size=max(10, G.degree(node_id) * 3),
+                        degree=degrees[node_id],
+                        size=max(10, degrees[node_id] * 3),
                         color=colors[cluster_id % len(colors)]
-                    )
-                    nodes.append(node)
-
-            # Create edges
-            edges = []
-            for edge in G.edges(data=True):
-                edge_obj = NetworkEdge(
-                    source=edge[0],
-                    target=edge[1],
-                    weight=edge[2].get('weight', 1.0),
+                    ))
+
+            edges = [
+                NetworkEdge.model_construct(
+                    source=user_ids[source],
+                    target=user_ids[target],
+                    weight=float(data.get('weight', 1.0)),
                     similarity_type="cosine_similarity"
                 )
-                edges.append(edge_obj)
+                for source, target, data in G.edges(data=True)
+            ]
 
             # Metadata
             metadata = {
                 "total_nodes": len(nodes),
                 "total_edges": len(edges),
-                "num_clusters": len(set(community_mapping.values())),
-                "algorithm_used": "greedy_modularity"
+                "num_clusters": num_clusters,
+                "algorithm_used": self._default_community_method(G)
             }
 
             return NetworkData(
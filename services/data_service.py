@@ -3,17 +3,21 @@ Data Processing Service for Event Networking AI System
 Analytics, statistics, and data processing utilities
 """
 
-import pandas as pd
-import numpy as np
-from typing import List, Dict, Optional, Tuple
+import csv
+import io
+from typing import Iterator, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, literal, select, union_all
 import logging
 
 from models.database import User, Event, EventAttendee, UserInterest, UserGoal, Recommendation
 
 logger = logging.getLogger(__name__)
 
+RECOMMENDATION_CSV_COLUMNS = (
+    "user_id", "recommended_user_id", "similarity_score", "confidence_level", "reason"
+)
+
 
 class DataService:
     """Data processing and analytics service"""
@@ -27,59 +31,83 @@ class DataService:
             if not event:
                 return {"error": "Event not found"}
 
-            # Attendee count
-            attendee_count = db.query(EventAttendee).filter(
-                EventAttendee.event_id == event_id
-            ).count()
-
-            # Industry distribution
-            industry_query = db.query(
+            # Every aggregate below reads from this one attendee CTE instead
+            # of re-joining EventAttendee and User per statistic
+            attendees = db.query(
+                User.id.label('user_id'),
                 User.industry,
-                func.count(User.id).label('count')
-            ).join(EventAttendee).filter(
-                EventAttendee.event_id == event_id,
-                User.industry.isnot(None)
-            ).group_by(User.industry).all()
-
-            industry_distribution = {
-                item.industry: item.count for item in industry_query
-            }
-
-            # Company distribution
-            company_query = db.query(
                 User.company,
-                func.count(User.id).label('count')
+                User.experience_years
             ).join(EventAttendee).filter(
-                EventAttendee.event_id == event_id,
-                User.company.isnot(None)
-            ).group_by(User.company).all()
-
-            company_distribution = {
-                item.company: item.count for item in company_query
-            }
+                EventAttendee.event_id == event_id
+            ).cte('attendees')
+
+            # Attendee count and experience aggregates in a single row
+            aggregates = [
+                func.count(),
+                func.count(attendees.c.experience_years),
+                func.min(attendees.c.experience_years),
+                func.max(attendees.c.experience_years),
+                func.avg(attendees.c.experience_years)
+            ]
+            has_percentile = db.get_bind().dialect.name == "postgresql"
+            if has_percentile:
+                aggregates.append(
+                    func.percentile_cont(0.5).within_group(attendees.c.experience_years.asc())
+                )
+
+            summary = db.query(*aggregates).select_from(attendees).one()
+            attendee_count, experience_count, experience_min, experience_max, experience_avg = summary[:5]
+
+            # Industry and company distributions in one round trip
+            distribution_rows = db.execute(union_all(
+                select(
+                    literal('industry').label('field'),
+                    attendees.c.industry.label('value'),
+                    func.count().label('count')
+                ).where(attendees.c.industry.isnot(None)).group_by(attendees.c.industry),
+                select(
+                    literal('company').label('field'),
+                    attendees.c.company.label('value'),
+                    func.count().label('count')
+                ).where(attendees.c.company.isnot(None)).group_by(attendees.c.company)
+            )).all()
+
+            industry_distribution = {}
+            company_distribution = {}
+            for row in distribution_rows:
+                target = industry_distribution if row.field == 'industry' else company_distribution
+                target[row.value] = row.count
 
             # Experience distribution
-            experience_query = db.query(User.experience_years).join(
-                EventAttendee
-            ).filter(
-                EventAttendee.event_id == event_id,
-                User.experience_years.isnot(None)
-            ).all()
-
-            experience_years = [e.experience_years for e in experience_query]
-            experience_stats = {
-                'min': min(experience_years) if experience_years else 0,
-                'max': max(experience_years) if experience_years else 0,
-                'avg': round(np.mean(experience_years), 1) if experience_years else 0,
-                'median': np.median(experience_years) if experience_years else 0
-            }
+            if experience_count:
+                if has_percentile:
+                    experience_median = float(summary[5])
+                else:
+                    # SQLite has no percentile function; fetch only the
+                    # middle one or two values
+                    middle = db.query(attendees.c.experience_years).filter(
+                        attendees.c.experience_years.isnot(None)
+                    ).order_by(attendees.c.experience_years).offset(
+                        (experience_count - 1) // 2
+                    ).limit(2 - experience_count % 2).all()
+                    experience_median = sum(m.experience_years for m in middle) / len(middle)
+
+                experience_stats = {
+                    'min': experience_min,
+                    'max': experience_max,
+                    'avg': round(float(experience_avg), 1),
+                    'median': experience_median
+                }
+            else:
+                experience_stats = {'min': 0, 'max': 0, 'avg': 0, 'median': 0}
 
             # Top interests
             interests_query = db.query(
                 UserInterest.interest,
                 func.count(UserInterest.id).label('count')
-            ).join(User).join(EventAttendee).filter(
-                EventAttendee.event_id == event_id
+            ).join(
+                attendees, UserInterest.user_id == attendees.c.user_id
             ).group_by(UserInterest.interest).order_by(
                 func.count(UserInterest.id).desc()
             ).limit(10).all()
@@ -207,38 +235,49 @@ class DataService:
             logger.error(f"Error getting recommendation analytics: {str(e)}")
             return {"error": str(e)}
 
+    @staticmethod
+    def iter_recommendations_csv(db: Session, event_id: int,
+                                 chunk_size: int = 5000) -> Iterator[str]:
+        """
+        Yield the recommendation CSV for an event in chunks of chunk_size rows.
+        Rows are fetched in batches and written as they arrive, so memory stays
+        flat however many recommendations the event has.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(RECOMMENDATION_CSV_COLUMNS)
+
+        rows = db.query(
+            Recommendation.user_id,
+            Recommendation.recommended_user_id,
+            Recommendation.similarity_score,
+            Recommendation.confidence_level,
+            Recommendation.reason
+        ).filter(
+            Recommendation.event_id == event_id,
+            Recommendation.is_active == True
+        ).yield_per(chunk_size)
+
+        for i, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if i % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
     @staticmethod
     def export_recommendations_to_csv(db: Session, event_id: int) -> str:
         """Export recommendations to CSV format"""
         try:
-            # Get all recommendations for the event
-            recommendations = db.query(
-                Recommendation.user_id,
-                Recommendation.recommended_user_id,
-                Recommendation.similarity_score,
-                Recommendation.confidence_level,
-                Recommendation.reason
-            ).filter(
-                Recommendation.event_id == event_id,
-                Recommendation.is_active == True
-            ).all()
+            csv_data = "".join(DataService.iter_recommendations_csv(db, event_id))
 
-            if not recommendations:
+            # Header only means there is nothing to export
+            if csv_data.count('\n') <= 1:
                 return ""
 
-            # Convert to DataFrame and CSV
-            df = pd.DataFrame([
-                {
-                    'user_id': rec.user_id,
-                    'recommended_user_id': rec.recommended_user_id,
-                    'similarity_score': rec.similarity_score,
-                    'confidence_level': rec.confidence_level,
-                    'reason': rec.reason
-                }
-                for rec in recommendations
-            ])
-
-            return df.to_csv(index=False)
+            return csv_data
 
         except Exception as e:
             logger.error(f"Error exporting recommendations: {str(e)}")
@@ -4,27 +4,153 @@ Handles OAuth authentication and LinkedIn API integration for profile data retri
 Based on LinkedIn's Get Profile API for professional networking enhancement.
 """
 
+import asyncio
+import hashlib
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Optional, Dict, List
-from urllib.parse import urlencode, parse_qs, urlparse
+import re
+import threading
+import time
+from typing import Optional, Dict, Iterable, List
+from urllib.parse import urlencode, parse_qs, urlparse, quote_plus
 import json
 from datetime import datetime, timedelta
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from config.settings import settings
+from database.cache import TTLCache
 from models.database import User, UserInterest, UserGoal
 
+# Optional C JSON decoder for API response bodies; both accept raw bytes
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Optional incremental JSON parser for large list responses
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional cache shared by every worker; enabled when settings.redis_url is set
+try:
+    import redis
+except ImportError:
+    redis = None
+
 logger = logging.getLogger(__name__)
 
 
+class _RateLimiter:
+    """
+    Process-wide LinkedIn rate limit state, fed from response headers.
+    Once LinkedIn reports the quota exhausted (X-RateLimit-Remaining: 0) or
+    answers 429, every request waits out Retry-After instead of hammering
+    the API with retries that are bound to fail.
+    """
+    
+    DEFAULT_BACKOFF = 60  # Seconds to hold off when LinkedIn gives no Retry-After
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.remaining: Optional[int] = None  # Unknown until LinkedIn reports it
+        self.blocked_until = 0.0  # time.monotonic() deadline
+    
+    def delay(self) -> float:
+        """Seconds to wait before the next request may be sent"""
+        with self._lock:
+            return max(0.0, self.blocked_until - time.monotonic())
+    
+    def update(self, status_code: int, headers) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        retry_after = headers.get('Retry-After')
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self.remaining = int(remaining)
+            if status_code == 429 or self.remaining == 0:
+                backoff = int(retry_after) if retry_after and retry_after.isdigit() else self.DEFAULT_BACKOFF
+                self.blocked_until = time.monotonic() + backoff
+                self.remaining = None
+
+
+_RATE_LIMITER = _RateLimiter()
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that holds requests while LinkedIn's rate limit is exhausted"""
+    
+    def send(self, request, **kwargs):
+        delay = _RATE_LIMITER.delay()
+        if delay:
+            logger.warning(f"LinkedIn rate limit reached, waiting {delay:.1f}s")
+            time.sleep(delay)
+        response = super().send(request, **kwargs)
+        _RATE_LIMITER.update(response.status_code, response.headers)
+        return response
+
+
+async def _wait_for_rate_limit(request: httpx.Request) -> None:
+    delay = _RATE_LIMITER.delay()
+    if delay:
+        logger.warning(f"LinkedIn rate limit reached, waiting {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+async def _record_rate_limit(response: httpx.Response) -> None:
+    _RATE_LIMITER.update(response.status_code, response.headers)
+
+
+# One keep-alive pool for all LinkedIn traffic in the process, shared by every
+# LinkedInService instance, so only the first request per host pays for the
+# TCP/TLS handshake. requests.Session is safe to share across threads for
+# plain requests like these. urllib3 retries run inside HTTPAdapter.send,
+# below the rate limiter, so 429 is left out of them: it is handed back to
+# the limiter, which holds every later request for Retry-After instead.
+_SESSION = requests.Session()
+_SESSION.mount('https://', _RateLimitedAdapter(
+    pool_connections=20,
+    pool_maxsize=100,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+))
+_SESSION.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+
 class LinkedInService:
     """
     LinkedIn API integration service for OAuth authentication and profile data retrieval.
     Supports LinkedIn OAuth 2.0 flow and Profile API endpoints.
     """
     
-    def __init__(self):
+    # Common tech/business keywords that might indicate interests
+    TECH_KEYWORDS = ('python', 'javascript', 'react', 'ai', 'machine learning', 'data science',
+                     'cloud', 'aws', 'azure', 'docker', 'kubernetes', 'blockchain')
+    
+    BUSINESS_KEYWORDS = ('marketing', 'sales', 'finance', 'hr', 'product management',
+                         'strategy', 'consulting', 'leadership', 'entrepreneurship')
+    
+    # Union and display titles are built once, not per headline
+    _ALL_KEYWORDS = TECH_KEYWORDS + BUSINESS_KEYWORDS
+    _MIN_KEYWORD_LENGTH = min(map(len, _ALL_KEYWORDS))
+    _KEYWORD_TITLES = {keyword: keyword.title() for keyword in _ALL_KEYWORDS}
+    
+    # All keywords in one alternation (longest first), matched as whole words
+    # in a single pass over the headline
+    _KEYWORD_PATTERN = re.compile(
+        r'\b(' + '|'.join(map(re.escape, sorted(_ALL_KEYWORDS, key=len, reverse=True))) + r')\b',
+        re.IGNORECASE
+    )
+    
+    # Token exchanges are one-shot, so their results are only kept long enough
+    # for a concurrent or retried callback with the same code to reuse them
+    CODE_RESULT_TTL = 60
+    CODE_LOCK_TTL = 10
+    
+    def __init__(self, redis_client: Optional["redis.Redis"] = None):
         self.client_id = getattr(settings, 'linkedin_client_id', None)
         self.client_secret = getattr(settings, 'linkedin_client_secret', None)
         self.redirect_uri = getattr(settings, 'linkedin_redirect_uri', 'http://localhost:8000/api/v1/linkedin/callback')
@@ -34,10 +160,62 @@ class LinkedInService:
         self.token_url = "https://www.linkedin.com/oauth/v2/accessToken"
         self.profile_url = "https://api.linkedin.com/v2/people/~"
         self.profile_fields = "id,localizedFirstName,localizedLastName,localizedHeadline,vanityName,profilePicture(displayImage~:playableStreams)"
+        self.email_url = "https://api.linkedin.com/v2/emailAddress?q=members&projection=(elements*(handle~))"
+        # Note: This endpoint may require special permission from LinkedIn
+        self.connections_url = "https://api.linkedin.com/v2/connections?q=viewer&projection=(elements*(to~))"
+        
+        # Everything but the state is fixed per client, so encode it once
+        self._auth_url_prefix = None
+        if self.client_id:
+            self._auth_url_prefix = f"{self.auth_url}?" + urlencode({
+                'response_type': 'code',
+                'client_id': self.client_id,
+                'redirect_uri': self.redirect_uri,
+                'scope': 'r_liteprofile r_emailaddress'  # Basic profile and email permissions
+            })
+        
+        # API rate limiting, shared by every instance in the process
+        self.rate_limiter = _RATE_LIMITER
+        
+        self.session = _SESSION
+        
+        # Recent token validation results, keyed by a SHA-256 of the token so
+        # raw tokens are never held in memory longer than a request
+        self._token_cache = TTLCache(ttl=settings.linkedin_token_cache_ttl, maxsize=10_000)
+        
+        # Shared cache of token exchanges and fetched profiles across workers
+        if redis_client is None and redis is not None and settings.redis_url:
+            redis_client = redis.Redis.from_url(settings.redis_url)
+        self.redis = redis_client
         
-        # API rate limiting
-        self.rate_limit_remaining = 1000
-        self.rate_limit_reset = datetime.now()
+        # Async counterpart for endpoints that fan out several calls at once;
+        # created on first use so it binds to the running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+    
+    def close(self):
+        """Release pooled LinkedIn connections (the pool reopens on next use)"""
+        self.session.close()
+    
+    async def aclose(self):
+        """Release the async client's pooled connections"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=30.0,
+                event_hooks={'request': [_wait_for_rate_limit], 'response': [_record_rate_limit]}
+            )
+        return self._async_client
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def get_authorization_url(self, state: str = None) -> str:
         """
@@ -49,19 +227,11 @@ class LinkedInService:
         Returns:
             Authorization URL for LinkedIn OAuth flow
         """
-        if not self.client_id:
+        if not self._auth_url_prefix:
             raise ValueError("LinkedIn client ID not configured")
         
-        params = {
-            'response_type': 'code',
-            'client_id': self.client_id,
-            'redirect_uri': self.redirect_uri,
-            'state': state or 'default_state',
-            'scope': 'r_liteprofile r_emailaddress'  # Basic profile and email permissions
-        }
-        
-        auth_url = f"{self.auth_url}?{urlencode(params)}"
-        logger.info(f"Generated LinkedIn authorization URL for client_id: {self.client_id}")
+        auth_url = f"{self._auth_url_prefix}&state={quote_plus(state or 'default_state')}"
+        logger.debug(f"Generated LinkedIn authorization URL for client_id: {self.client_id}")
         return auth_url
     
     def exchange_code_for_token(self, authorization_code: str) -> Dict:
@@ -77,6 +247,15 @@ class LinkedInService:
         if not self.client_id or not self.client_secret:
             raise ValueError("LinkedIn credentials not configured")
         
+        # Another worker may already be exchanging (or have exchanged) this code
+        code_key = f"li:code:{self._token_key(authorization_code)}"
+        cached = self._shared_get(code_key)
+        if cached is None and not self._shared_lock(f"{code_key}:lock", self.CODE_LOCK_TTL):
+            cached = self._shared_wait(code_key, self.CODE_LOCK_TTL)
+        if cached is not None:
+            cached['expires_at'] = datetime.fromisoformat(cached['expires_at'])
+            return cached
+        
         token_data = {
             'grant_type': 'authorization_code',
             'code': authorization_code,
@@ -86,7 +265,7 @@ class LinkedInService:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.token_url,
                 data=token_data,
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
@@ -94,29 +273,41 @@ class LinkedInService:
             )
             response.raise_for_status()
             
-            token_info = response.json()
+            token_info = _json_loads(response.content)
             logger.info("Successfully exchanged authorization code for access token")
-            return {
+            if token_info.get('access_token'):
+                # A freshly issued token is known to be valid
+                self._token_cache.put(self._token_key(token_info['access_token']), True)
+            result = {
                 'access_token': token_info.get('access_token'),
                 'expires_in': token_info.get('expires_in'),
                 'token_type': token_info.get('token_type', 'Bearer'),
                 'expires_at': datetime.now() + timedelta(seconds=token_info.get('expires_in', 3600))
             }
+            self._shared_set(code_key, self.CODE_RESULT_TTL, result)
+            return result
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error exchanging authorization code: {str(e)}")
             raise Exception(f"LinkedIn token exchange failed: {str(e)}")
     
-    def fetch_profile(self, access_token: str) -> Dict:
+    def fetch_profile(self, access_token: str, include_raw: bool = False) -> Dict:
         """
         Fetch LinkedIn profile data using access token.
         
         Args:
             access_token: Valid LinkedIn access token
+            include_raw: Also return the unparsed API response under 'raw_data'
             
         Returns:
             Dictionary containing profile data
         """
+        # Raw payloads are never cached, so those requests always go to LinkedIn
+        profile_key = f"li:profile:{self._token_key(access_token)}"
+        cached = None if include_raw else self._shared_get(profile_key)
+        if cached is not None:
+            return cached
+        
         try:
             headers = {
                 'Authorization': f'Bearer {access_token}',
@@ -125,16 +316,18 @@ class LinkedInService:
             
             # Fetch basic profile
             profile_url = f"{self.profile_url}?projection=({self.profile_fields})"
-            response = requests.get(profile_url, headers=headers, timeout=30)
+            response = self.session.get(profile_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            profile_data = response.json()
+            profile_data = _json_loads(response.content)
             
             # Fetch email separately (requires different endpoint)
             email_data = self._fetch_email(access_token)
             
             # Parse and format profile data
-            formatted_profile = self._parse_profile_data(profile_data, email_data)
+            formatted_profile = self._parse_profile_data(profile_data, email_data, include_raw)
+            if not include_raw:
+                self._shared_set(profile_key, settings.linkedin_profile_cache_ttl, formatted_profile)
             
             logger.info(f"Successfully fetched LinkedIn profile for user: {formatted_profile.get('name', 'Unknown')}")
             return formatted_profile
@@ -147,44 +340,99 @@ class LinkedInService:
         """Fetch user email from LinkedIn email endpoint"""
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
-            email_url = "https://api.linkedin.com/v2/emailAddress?q=members&projection=(elements*(handle~))"
             
-            response = requests.get(email_url, headers=headers, timeout=30)
+            response = self.session.get(self.email_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            return response.json()
+            return _json_loads(response.content)
             
         except Exception as e:
             logger.warning(f"Could not fetch email from LinkedIn: {str(e)}")
             return {}
     
-    def _parse_profile_data(self, profile_data: Dict, email_data: Dict) -> Dict:
+    async def fetch_profile_async(self, access_token: str, include_raw: bool = False) -> Dict:
+        """
+        Async variant of fetch_profile; the profile and email requests are
+        issued concurrently, so the bundle costs one round trip instead of two.
+        
+        Args:
+            access_token: Valid LinkedIn access token
+            include_raw: Also return the unparsed API response under 'raw_data'
+            
+        Returns:
+            Dictionary containing profile data
+        """
+        profile_key = f"li:profile:{self._token_key(access_token)}"
+        cached = None if include_raw else await self._shared_get_async(profile_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            client = self._get_async_client()
+            headers = {
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json'
+            }
+            
+            profile_url = f"{self.profile_url}?projection=({self.profile_fields})"
+            response, email_data = await asyncio.gather(
+                client.get(profile_url, headers=headers),
+                self._fetch_email_async(client, access_token)
+            )
+            response.raise_for_status()
+            
+            formatted_profile = self._parse_profile_data(_json_loads(response.content), email_data, include_raw)
+            if not include_raw:
+                await self._shared_set_async(profile_key, settings.linkedin_profile_cache_ttl, formatted_profile)
+            
+            logger.info(f"Successfully fetched LinkedIn profile for user: {formatted_profile.get('name', 'Unknown')}")
+            return formatted_profile
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching LinkedIn profile: {str(e)}")
+            raise Exception(f"LinkedIn profile fetch failed: {str(e)}")
+    
+    async def _fetch_email_async(self, client: httpx.AsyncClient, access_token: str) -> Dict:
+        """Async variant of _fetch_email"""
+        try:
+            headers = {'Authorization': f'Bearer {access_token}'}
+            
+            response = await client.get(self.email_url, headers=headers)
+            response.raise_for_status()
+            
+            return _json_loads(response.content)
+            
+        except Exception as e:
+            logger.warning(f"Could not fetch email from LinkedIn: {str(e)}")
+            return {}
+    
+    def _parse_profile_data(self, profile_data: Dict, email_data: Dict, include_raw: bool = False) -> Dict:
         """
         Parse raw LinkedIn API response into standardized format.
         
         Args:
             profile_data: Raw profile data from LinkedIn API
             email_data: Raw email data from LinkedIn API
+            include_raw: Keep the raw profile response under 'raw_data'
             
         Returns:
             Formatted profile dictionary
         """
         try:
-            # Extract email
-            email = None
-            if email_data.get('elements'):
-                email_element = email_data['elements'][0]
-                email = email_element.get('handle~', {}).get('emailAddress')
-            
-            # Extract profile picture
-            profile_picture_url = None
-            if profile_data.get('profilePicture'):
-                display_image = profile_data['profilePicture'].get('displayImage~')
-                if display_image and display_image.get('elements'):
-                    # Get the largest available image
-                    images = display_image['elements']
-                    if images:
-                        profile_picture_url = images[-1].get('identifiers', [{}])[0].get('identifier')
+            # Nested lookups are done EAFP: the happy path is a straight chain of
+            # subscripts, and any missing level just means the field is absent
+            try:
+                email = email_data['elements'][0]['handle~']['emailAddress']
+            except (KeyError, IndexError, TypeError):
+                email = None
+            
+            # Profile picture: the last element is the largest available image
+            try:
+                profile_picture_url = (
+                    profile_data['profilePicture']['displayImage~']['elements'][-1]['identifiers'][0]['identifier']
+                )
+            except (KeyError, IndexError, TypeError):
+                profile_picture_url = None
             
             # Create LinkedIn profile URL
             vanity_name = profile_data.get('vanityName')
@@ -192,15 +440,16 @@ class LinkedInService:
             
             formatted_profile = {
                 'linkedin_id': profile_data.get('id'),
-                'name': f"{profile_data.get('localizedFirstName', '')} {profile_data.get('localizedLastName', '')}".strip(),
+                'name': self._full_name(profile_data),
                 'email': email,
                 'headline': profile_data.get('localizedHeadline', ''),
                 'linkedin_url': linkedin_url,
                 'profile_picture_url': profile_picture_url,
                 'vanity_name': vanity_name,
-                'raw_data': profile_data,
                 'fetched_at': datetime.now().isoformat()
             }
+            if include_raw:
+                formatted_profile['raw_data'] = profile_data
             
             return formatted_profile
             
@@ -222,8 +471,9 @@ class LinkedInService:
         """
         try:
             if user_id:
-                # Update existing user
-                user = db.query(User).filter(User.id == user_id).first()
+                # Update existing user; get() is served from the identity map
+                # when the caller already loaded this user
+                user = db.get(User, user_id)
                 if not user:
                     raise ValueError(f"User with ID {user_id} not found")
                 
@@ -265,33 +515,46 @@ class LinkedInService:
             db.rollback()
             raise
     
+    @classmethod
+    def _headline_interests(cls, headline: str) -> List[str]:
+        """
+        Keyword titles found in a headline, in keyword-list order. Keywords
+        match whole words only: "AI" and "AWS-certified" count, while
+        "Pythonista", "ReactJS", "maintainer" and "Chrome" do not
+        """
+        matched = {match.lower() for match in cls._KEYWORD_PATTERN.findall(headline)}
+        return [cls._KEYWORD_TITLES[keyword] for keyword in cls._ALL_KEYWORDS if keyword in matched]
+    
     def _extract_interests_from_headline(self, db: Session, user: User, headline: str):
         """
         Extract potential interests and goals from LinkedIn headline using basic NLP.
         This is a simplified implementation - you could enhance with more sophisticated NLP.
         """
+        # Too short to hold any keyword: nothing to scan or look up
+        if not headline or len(headline) < self._MIN_KEYWORD_LENGTH:
+            return
+        
         try:
-            headline_lower = headline.lower()
-            
-            # Common tech/business keywords that might indicate interests
-            tech_keywords = ['python', 'javascript', 'react', 'ai', 'machine learning', 'data science', 
-                           'cloud', 'aws', 'azure', 'docker', 'kubernetes', 'blockchain']
+            found_interests = self._headline_interests(headline)
             
-            business_keywords = ['marketing', 'sales', 'finance', 'hr', 'product management', 
-                               'strategy', 'consulting', 'leadership', 'entrepreneurship']
+            if not found_interests:
+                logger.debug("No interests found in LinkedIn headline")
+                return
             
-            # Extract interests
-            found_interests = []
-            for keyword in tech_keywords + business_keywords:
-                if keyword in headline_lower:
-                    found_interests.append(keyword.title())
-            
-            # Add interests to user (avoid duplicates)
-            existing_interests = {interest.interest.lower() for interest in user.interests}
-            for interest in found_interests[:5]:  # Limit to 5 interests
-                if interest.lower() not in existing_interests:
-                    db_interest = UserInterest(user_id=user.id, interest=interest)
-                    db.add(db_interest)
+            # Add interests to user (avoid duplicates); only the lowered names
+            # are needed, so skip loading the interest rows themselves
+            existing_interests = {
+                interest for (interest,) in db.query(func.lower(UserInterest.interest)).filter(
+                    UserInterest.user_id == user.id
+                )
+            }
+            # Added together so the flush batches them into one multi-row
+            # INSERT while still firing the cache invalidation hooks
+            db.add_all([
+                UserInterest(user_id=user.id, interest=interest)
+                for interest in found_interests[:5]  # Limit to 5 interests
+                if interest.lower() not in existing_interests
+            ])
             
             logger.info(f"Extracted {len(found_interests)} interests from LinkedIn headline")
             
@@ -312,37 +575,93 @@ class LinkedInService:
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
             
-            # Note: This endpoint may require special permission from LinkedIn
-            connections_url = "https://api.linkedin.com/v2/connections?q=viewer&projection=(elements*(to~))"
+            # With ijson the body is parsed as it arrives, one element at a
+            # time, instead of materializing the whole response first
+            with self.session.get(self.connections_url, headers=headers, timeout=30,
+                                  stream=ijson is not None) as response:
+                if response.status_code == 403:
+                    logger.warning("LinkedIn connections API access not permitted for this application")
+                    return []
+                
+                response.raise_for_status()
+                if ijson is not None:
+                    response.raw.decode_content = True
+                    elements = ijson.items(response.raw, 'elements.item')
+                else:
+                    elements = _json_loads(response.content).get('elements', [])
+                
+                connections = self._parse_connections(elements)
             
-            response = requests.get(connections_url, headers=headers, timeout=30)
+            logger.info(f"Successfully fetched {len(connections)} LinkedIn connections")
+            return connections
             
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching LinkedIn connections: {str(e)}")
+            return []
+    
+    async def fetch_connections_async(self, access_token: str, total_pages: int = 1,
+                                      page_size: int = 50, concurrency: int = 8) -> List[Dict]:
+        """
+        Fetch several pages of LinkedIn connections concurrently.
+        
+        Args:
+            access_token: Valid LinkedIn access token
+            total_pages: Number of pages to request
+            page_size: Connections per page
+            concurrency: Maximum requests in flight at once
+            
+        Returns:
+            List of connection profiles, in page order
+        """
+        client = self._get_async_client()
+        headers = {'Authorization': f'Bearer {access_token}'}
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_page(start: int) -> Optional[List[Dict]]:
+            async with semaphore:
+                response = await client.get(
+                    f"{self.connections_url}&start={start}&count={page_size}", headers=headers
+                )
             if response.status_code == 403:
+                return None
+            response.raise_for_status()
+            return _json_loads(response.content).get('elements', [])
+        
+        try:
+            pages = await asyncio.gather(*(fetch_page(page * page_size) for page in range(total_pages)))
+            
+            if any(page is None for page in pages):
                 logger.warning("LinkedIn connections API access not permitted for this application")
                 return []
             
-            response.raise_for_status()
-            connections_data = response.json()
-            
-            # Parse connections
-            connections = []
-            for element in connections_data.get('elements', []):
-                connection = element.get('to~', {})
-                if connection:
-                    connections.append({
-                        'linkedin_id': connection.get('id'),
-                        'name': f"{connection.get('localizedFirstName', '')} {connection.get('localizedLastName', '')}".strip(),
-                        'headline': connection.get('localizedHeadline', ''),
-                        'profile_url': f"https://www.linkedin.com/in/{connection.get('vanityName', '')}/" if connection.get('vanityName') else None
-                    })
+            connections = self._parse_connections(element for page in pages for element in page)
             
             logger.info(f"Successfully fetched {len(connections)} LinkedIn connections")
             return connections
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching LinkedIn connections: {str(e)}")
             return []
     
+    @staticmethod
+    def _full_name(member: Dict) -> str:
+        """Join first and last name, skipping missing parts instead of stripping"""
+        return ' '.join(part for part in (member.get('localizedFirstName'), member.get('localizedLastName')) if part)
+    
+    def _parse_connections(self, elements: Iterable[Dict]) -> List[Dict]:
+        """Parse raw connection elements into standardized format"""
+        connections = []
+        for element in elements:
+            connection = element.get('to~', {})
+            if connection:
+                connections.append({
+                    'linkedin_id': connection.get('id'),
+                    'name': self._full_name(connection),
+                    'headline': connection.get('localizedHeadline', ''),
+                    'profile_url': f"https://www.linkedin.com/in/{connection.get('vanityName', '')}/" if connection.get('vanityName') else None
+                })
+        return connections
+    
     def validate_token(self, access_token: str) -> bool:
         """
         Validate LinkedIn access token by making a test API call.
@@ -353,11 +672,82 @@ class LinkedInService:
         Returns:
             True if token is valid, False otherwise
         """
+        key = self._token_key(access_token)
+        cached = self._token_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.get(self.profile_url, headers=headers, timeout=10)
-            return response.status_code == 200
+            response = self.session.get(self.profile_url, headers=headers, timeout=10)
+            is_valid = response.status_code == 200
+            
+            # Only cache definitive answers; transient failures are re-checked
+            if is_valid or response.status_code == 401:
+                self._token_cache.put(key, is_valid)
+            return is_valid
             
         except Exception:
             return False
+    
+    @staticmethod
+    def _token_key(access_token: str) -> str:
+        return hashlib.sha256(access_token.encode()).hexdigest()
+    
+    # Shared (Redis) cache helpers. Each is a no-op without Redis, and a Redis
+    # failure only costs the cache: it is logged and the LinkedIn call proceeds
+    
+    def _shared_get(self, key: str) -> Optional[Dict]:
+        if self.redis is None:
+            return None
+        try:
+            cached = self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Shared LinkedIn cache read failed: {str(e)}")
+            return None
+        return _json_loads(cached) if cached is not None else None
+    
+    def _shared_set(self, key: str, ttl: int, value: Dict):
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(key, ttl, json.dumps(value, default=lambda v: v.isoformat()))
+        except Exception as e:
+            logger.warning(f"Shared LinkedIn cache write failed: {str(e)}")
+    
+    # The Redis client is blocking, so the async paths run it on a worker
+    # thread instead of stalling the event loop for each round trip
+    
+    async def _shared_get_async(self, key: str) -> Optional[Dict]:
+        if self.redis is None:
+            return None
+        return await asyncio.to_thread(self._shared_get, key)
+    
+    async def _shared_set_async(self, key: str, ttl: int, value: Dict):
+        if self.redis is None:
+            return
+        await asyncio.to_thread(self._shared_set, key, ttl, value)
+    
+    def _shared_lock(self, key: str, ttl: int) -> bool:
+        """Take a short-lived cross-worker lock; True when there is no Redis"""
+        if self.redis is None:
+            return True
+        try:
+            return bool(self.redis.set(key, 1, nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning(f"Shared LinkedIn cache lock failed: {str(e)}")
+            return True
+    
+    def _shared_wait(self, key: str, timeout: float) -> Optional[Dict]:
+        """
+        Poll for a value another worker is about to store. Blocking: only for
+        the sync token exchange, which routes already run off the event loop
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            value = self._shared_get(key)
+            if value is not None:
+                return value
+            time.sleep(0.1)
+        return None
 
@@ -6,26 +6,56 @@ cosine similarity to suggest meaningful connections between event attendees.
 
 import pandas as pd
 import numpy as np
+from scipy import sparse
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import StandardScaler, normalize
 from typing import List, Dict, Tuple, Optional
 import logging
+from collections import defaultdict
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime
 import json
 
+from config.settings import settings
+from database.cache import event_cache_key, event_graph_cache, get_user_snapshots
 from models.database import User, Event, EventAttendee, UserInterest, UserGoal, Recommendation
-from utils.helpers import calculate_recommendation_confidence, Timer
+from utils.helpers import confidence_levels_batch, Timer
+
+# Optional approximate nearest-neighbour index for very large events
+try:
+    import faiss
+except ImportError:
+    faiss = None
 
 logger = logging.getLogger(__name__)
 
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE for recommendation upserts
+UPSERT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+# Columns refreshed when a recommendation pair already exists
+UPSERT_UPDATE_COLUMNS = (
+    'similarity_score', 'confidence_level', 'reason', 'mutual_interests',
+    'complementary_goals', 'algorithm_version', 'is_active', 'updated_at'
+)
+
 class RecommendationEngine:
     """
     AI-powered recommendation engine for event networking
     Uses collaborative filtering and content-based approaches
     """
-    
-    def __init__(self, 
+
+    # Rows per bulk insert flush when saving recommendations
+    INSERT_BATCH_SIZE = 10_000
+
+    def __init__(self,
                  max_features: int = 1000,
                  min_similarity_threshold: float = 0.1,
                  ngram_range: Tuple[int, int] = (1, 2)):
@@ -48,7 +78,8 @@ class RecommendationEngine:
             ngram_range=self.ngram_range,
             lowercase=True,
             strip_accents='unicode',
-            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9]*\b'
+            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9]*\b',
+            dtype=np.float32
         )
         
         # Initialize scaler for numerical features
@@ -94,21 +125,24 @@ class RecommendationEngine:
                 'experience_years': a.experience_years or 0
             } for a in attendees])
             
-            # Enrich with interests and goals
-            for idx, row in df.iterrows():
-                user_id = row['user_id']
-                
-                # Get user interests
-                interests = db.query(UserInterest.interest).filter(
-                    UserInterest.user_id == user_id
-                ).all()
-                df.at[idx, 'interests'] = ', '.join([i.interest for i in interests])
-                
-                # Get user goals
-                goals = db.query(UserGoal.goal).filter(
-                    UserGoal.user_id == user_id
-                ).all()
-                df.at[idx, 'goals'] = ', '.join([g.goal for g in goals])
+            # Enrich with interests and goals: one query each for the whole
+            # event instead of two per attendee. The explicit orders match what
+            # the per-user lookups returned (interests via their unique
+            # index); TF-IDF bigrams span neighbouring entries, so order counts
+            interests = defaultdict(list)
+            for user_id, interest in db.query(UserInterest.user_id, UserInterest.interest).join(
+                EventAttendee, EventAttendee.user_id == UserInterest.user_id
+            ).filter(EventAttendee.event_id == event_id).order_by(UserInterest.interest):
+                interests[user_id].append(interest)
+            
+            goals = defaultdict(list)
+            for user_id, goal in db.query(UserGoal.user_id, UserGoal.goal).join(
+                EventAttendee, EventAttendee.user_id == UserGoal.user_id
+            ).filter(EventAttendee.event_id == event_id).order_by(UserGoal.id):
+                goals[user_id].append(goal)
+            
+            df['interests'] = [', '.join(interests[user_id]) for user_id in df['user_id']]
+            df['goals'] = [', '.join(goals[user_id]) for user_id in df['user_id']]
             
             logger.info(f"Retrieved {len(df)} attendees for event {event_id}")
             return df
@@ -117,12 +151,13 @@ class RecommendationEngine:
             logger.error(f"Error retrieving attendee data: {str(e)}")
             return pd.DataFrame()
     
-    def create_user_features(self, df: pd.DataFrame) -> np.ndarray:
+    def create_user_features(self, df: pd.DataFrame, as_sparse: bool = False) -> np.ndarray:
         """
         Create feature vectors for users using TF-IDF and numerical features
         
         Args:
             df: DataFrame with user information
+            as_sparse: Return a CSR matrix instead of densifying the TF-IDF block
             
         Returns:
             Combined feature matrix
@@ -131,35 +166,32 @@ class RecommendationEngine:
             return np.array([])
         
         try:
-            # Combine text features for each user
-            text_features = []
-            for _, row in df.iterrows():
-                # Combine all textual information
-                combined_text = ' '.join([
-                    str(row.get('job_title', '')),
-                    str(row.get('company', '')),
-                    str(row.get('industry', '')),
-                    str(row.get('bio', '')),
-                    str(row.get('interests', '')),
-                    str(row.get('goals', ''))
-                ]).strip()
-                
-                text_features.append(combined_text if combined_text else ' ')
-            
-            # Vectorize text features using TF-IDF
-            text_vectors = self.vectorizer.fit_transform(text_features)
-            
-            # Create numerical features
-            numerical_features = []
-            for _, row in df.iterrows():
-                exp_years = row.get('experience_years', 0) or 0
-                # Normalize experience years (0-40 scale)
-                normalized_exp = min(exp_years / 40.0, 1.0)
-                numerical_features.append([normalized_exp])
-            
-            numerical_features = np.array(numerical_features)
+            # Combine all textual information per user, column-wise
+            text_columns = ['job_title', 'company', 'industry', 'bio', 'interests', 'goals']
+            text_parts = [
+                df[column].astype(str) if column in df else pd.Series('', index=df.index)
+                for column in text_columns
+            ]
+            combined_text = text_parts[0].str.cat(text_parts[1:], sep=' ').str.strip()
+            text_features = combined_text.where(combined_text != '', ' ').tolist()
+            
+            # Vectorize text features using TF-IDF; fit a fresh copy so
+            # concurrent runs never share a vocabulary on the engine
+            text_vectors = clone(self.vectorizer).fit_transform(text_features)
+            
+            # Create numerical features: experience years normalized to a 0-40 scale
+            if 'experience_years' in df:
+                exp_years = df['experience_years'].fillna(0).to_numpy(dtype=np.float32)
+            else:
+                exp_years = np.zeros(len(df), dtype=np.float32)
+            numerical_features = np.minimum(exp_years / np.float32(40.0), np.float32(1.0)).reshape(-1, 1)
             
             # Combine text and numerical features
+            if as_sparse:
+                combined_features = sparse.hstack([text_vectors, numerical_features], format='csr')
+                logger.info(f"Created sparse feature matrix of shape {combined_features.shape}")
+                return combined_features
+
             text_dense = text_vectors.toarray()
             combined_features = np.hstack([text_dense, numerical_features])
             
@@ -170,21 +202,37 @@ class RecommendationEngine:
             logger.error(f"Error creating user features: {str(e)}")
             return np.array([])
     
-    def calculate_similarity_matrix(self, features: np.ndarray) -> np.ndarray:
+    def calculate_similarity_matrix(self, features: np.ndarray,
+                                    threshold: Optional[float] = None) -> np.ndarray:
         """
         Calculate cosine similarity matrix between users
         
         Args:
             features: Feature matrix
+            threshold: If set, return a sparse CSR matrix keeping only scores
+                above it (pass sparse features to avoid any dense N x N buffer)
             
         Returns:
             Similarity matrix
         """
-        if features.size == 0:
+        if features.shape[0] == 0:
             return np.array([])
         
         try:
-            similarity_matrix = cosine_similarity(features)
+            if threshold is not None:
+                similarity_matrix = cosine_similarity(features, dense_output=False)
+                similarity_matrix = sparse.csr_matrix(
+                    similarity_matrix.multiply(similarity_matrix > threshold)
+                )
+                similarity_matrix.eliminate_zeros()
+                logger.info(f"Calculated sparse similarity matrix with {similarity_matrix.nnz} entries")
+                return similarity_matrix
+
+            # Unit-length rows turn cosine similarity into a single FP32 matmul
+            normalized = normalize(features)
+            similarity_matrix = normalized @ normalized.T
+            if sparse.issparse(similarity_matrix):
+                similarity_matrix = similarity_matrix.toarray()
             logger.info(f"Calculated similarity matrix of shape {similarity_matrix.shape}")
             return similarity_matrix
             
@@ -192,6 +240,48 @@ class RecommendationEngine:
             logger.error(f"Error calculating similarity matrix: {str(e)}")
             return np.array([])
     
+    def calculate_top_k_similarities(self, features, k: int) -> sparse.csr_matrix:
+        """
+        Approximate each user's k most similar users with a FAISS HNSW index
+        over 8-bit quantized vectors, then rescore the survivors exactly
+        
+        Args:
+            features: Feature matrix (dense or sparse)
+            k: Neighbours wanted per user, excluding the user itself
+            
+        Returns:
+            Sparse CSR similarity matrix holding at most 2k candidate scores per row
+        """
+        n_users = features.shape[0]
+        normalized = normalize(sparse.csr_matrix(features, dtype=np.float32))
+        dense = np.ascontiguousarray(normalized.toarray())
+        
+        # Unit vectors fit int8 well, and the index holds a quarter of the FP32 bytes
+        index = faiss.IndexHNSWSQ(
+            dense.shape[1], faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(dense)
+        index.add(dense)
+        # Oversample so the exact rescoring below can recover neighbours that
+        # quantization pushed just past the cutoff
+        _, neighbours = index.search(dense, min(2 * k + 1, n_users))
+        del dense
+        
+        # Drop self matches and the -1 padding FAISS uses for short result lists
+        rows = np.repeat(np.arange(n_users), neighbours.shape[1])
+        cols = neighbours.ravel()
+        keep = (cols >= 0) & (cols != rows)
+        rows, cols = rows[keep], cols[keep]
+        
+        # Stored scores stay full FP32: recompute each kept pair's cosine from
+        # the sparse rows rather than keeping the quantized inner product
+        scores = np.asarray(normalized[rows].multiply(normalized[cols]).sum(axis=1)).ravel()
+        similarity_matrix = sparse.csr_matrix(
+            (scores, (rows, cols)), shape=(n_users, n_users)
+        )
+        logger.info(f"Calculated top-{k} similarities for {n_users} users with FAISS HNSW (SQ8)")
+        return similarity_matrix
+    
     def generate_recommendations(self, 
                                db: Session, 
                                event_id: int,
@@ -218,19 +308,13 @@ class RecommendationEngine:
                     logger.warning(f"Insufficient attendees for recommendations in event {event_id}")
                     return []
                 
-                # Create feature vectors
-                features = self.create_user_features(df)
-                if features.size == 0:
-                    logger.error("Failed to create feature vectors")
-                    return []
-                
-                # Calculate similarity matrix
-                similarity_matrix = self.calculate_similarity_matrix(features)
-                if similarity_matrix.size == 0:
-                    logger.error("Failed to calculate similarity matrix")
+                similarity_matrix = self._get_similarity_matrix(db, event_id, df, max_recommendations)
+                if similarity_matrix.shape[0] == 0:
                     return []
                 
-                # Generate recommendations
+                # Generate recommendations from plain dicts; pandas row access
+                # is far too slow for the per-pair loop
+                profiles = self._profile_records(df)
                 recommendations = []
                 
                 if target_user_id:
@@ -241,15 +325,23 @@ class RecommendationEngine:
                         return []
                     
                     user_recommendations = self._generate_user_recommendations(
-                        df, similarity_matrix, user_indices[0], max_recommendations
+                        profiles, similarity_matrix, user_indices[0], max_recommendations
                     )
                     recommendations.extend(user_recommendations)
                 else:
-                    # Generate for all users
-                    for idx in range(len(df)):
-                        user_recommendations = self._generate_user_recommendations(
-                            df, similarity_matrix, idx, max_recommendations
+                    # Generate for all users; rows are independent and the per-row
+                    # NumPy filtering releases the GIL, so large events use threads.
+                    # The pool is capped: each request already runs on its own
+                    # worker thread, so n_jobs=-1 would oversubscribe the cores
+                    n_jobs = (settings.parallel_recommendation_jobs
+                              if len(profiles) >= settings.parallel_recommendation_min_attendees else 1)
+                    per_user = Parallel(n_jobs=n_jobs, prefer='threads', batch_size=32)(
+                        delayed(self._generate_user_recommendations)(
+                            profiles, similarity_matrix, idx, max_recommendations
                         )
+                        for idx in range(len(profiles))
+                    )
+                    for user_recommendations in per_user:
                         recommendations.extend(user_recommendations)
                 
                 # Save recommendations to database
@@ -262,8 +354,101 @@ class RecommendationEngine:
             logger.error(f"Error generating recommendations: {str(e)}")
             return []
     
+    def _get_similarity_matrix(self, db: Session, event_id: int, df: pd.DataFrame,
+                               max_recommendations: int):
+        """
+        Build the event's similarity matrix, reusing a recent one for the same
+        attendees (see database.cache.event_graph_cache)
+        
+        Args:
+            db: Database session
+            event_id: ID of the event
+            df: DataFrame from get_event_attendees_data
+            max_recommendations: Neighbours kept per user on the top-k path
+            
+        Returns:
+            Similarity matrix, or an empty array on failure
+        """
+        use_ann = faiss is not None and len(df) >= settings.ann_min_attendees
+        # Engines configured differently must not share each other's matrix
+        key = event_cache_key(db, event_id, 'similarity', self.max_features, self.ngram_range,
+                              self.min_similarity_threshold, max_recommendations if use_ann else None)
+        user_ids = tuple(df['user_id'])
+        cached = event_graph_cache.get(key)
+        if cached is not None and cached[0] == user_ids:
+            return cached[1]
+        
+        # Create feature vectors; the TF-IDF block stays sparse so the
+        # similarity product only touches non-zero terms
+        features = self.create_user_features(df, as_sparse=True)
+        if features.shape[0] == 0:
+            logger.error("Failed to create feature vectors")
+            return np.array([])
+        
+        # Calculate similarity matrix; very large events only keep each
+        # user's nearest neighbours instead of the full N x N matrix
+        if use_ann:
+            similarity_matrix = self.calculate_top_k_similarities(features, max_recommendations)
+        else:
+            similarity_matrix = self.calculate_similarity_matrix(features)
+        if similarity_matrix.shape[0] == 0:
+            logger.error("Failed to calculate similarity matrix")
+            return similarity_matrix
+        
+        event_graph_cache.put(key, (user_ids, similarity_matrix))
+        return similarity_matrix
+    
+    @staticmethod
+    def _split_lowercase(value: Optional[str]) -> set:
+        """Split a comma-joined interests/goals string into a lowercase set"""
+        items = set((value or '').lower().split(', '))
+        items.discard('')
+        return items
+    
+    def _profile_records(self, df: pd.DataFrame) -> List[Dict]:
+        """
+        Convert attendee rows to plain dicts for the recommendation loop
+        
+        Args:
+            df: DataFrame with user data
+            
+        Returns:
+            One dict per row, with 'interest_set' and 'goal_set' precomputed and
+            interests also encoded as 'interest_bits' over the shared, sorted
+            'interest_vocab'; 'industry_id'/'company_id' are integer codes for
+            non-empty values (None otherwise) so pair checks compare ints
+        """
+        records = df.to_dict('records')
+        for record in records:
+            record['interest_set'] = self._split_lowercase(record.get('interests', ''))
+            record['goal_set'] = self._split_lowercase(record.get('goals', ''))
+        
+        for column in ('industry', 'company'):
+            codes = pd.factorize(df[column])[0].tolist()
+            for record, code in zip(records, codes):
+                record[f'{column}_id'] = code if code >= 0 and record[column] else None
+        
+        # One bit per distinct interest turns every pairwise overlap check into
+        # a single AND; Python ints keep this exact past 64 interests
+        vocab = tuple(sorted(set().union(*(record['interest_set'] for record in records))))
+        bit_for = {term: 1 << position for position, term in enumerate(vocab)}
+        for record in records:
+            record['interest_bits'] = sum(bit_for[term] for term in record['interest_set'])
+            record['interest_vocab'] = vocab
+        return records
+    
+    @staticmethod
+    def _decode_interest_bits(bits: int, vocab: Tuple[str, ...], limit: int) -> List[str]:
+        """Return up to limit interests set in bits, in vocabulary order"""
+        terms = []
+        while bits and len(terms) < limit:
+            lowest = bits & -bits
+            terms.append(vocab[lowest.bit_length() - 1])
+            bits ^= lowest
+        return terms
+    
     def _generate_user_recommendations(self, 
-                                     df: pd.DataFrame,
+                                     profiles: List[Dict],
                                      similarity_matrix: np.ndarray,
                                      user_idx: int,
                                      max_recommendations: int) -> List[Dict]:
@@ -271,8 +456,8 @@ class RecommendationEngine:
         Generate recommendations for a specific user
         
         Args:
-            df: DataFrame with user data
-            similarity_matrix: Precomputed similarity matrix
+            profiles: User records from _profile_records
+            similarity_matrix: Precomputed similarity matrix (dense, or sparse top-k)
             user_idx: Index of the user in the DataFrame
             max_recommendations: Maximum number of recommendations
             
@@ -280,57 +465,70 @@ class RecommendationEngine:
             List of recommendations for the user
         """
         try:
-            user_similarities = similarity_matrix[user_idx]
-            user_data = df.iloc[user_idx]
-            
-            # Create recommendations for other users
+            if sparse.issparse(similarity_matrix):
+                row = similarity_matrix.getrow(user_idx)
+                candidates, scores = row.indices, row.data
+            else:
+                scores = np.asarray(similarity_matrix[user_idx])
+                candidates = np.arange(len(scores))
+            user_data = profiles[user_idx]
+            
+            # Skip self and low similarity scores
+            keep = (candidates != user_idx) & (scores > self.min_similarity_threshold)
+            candidates, scores = candidates[keep], scores[keep]
+            
+            # Narrow to the top N in C before building any dicts; everything tied
+            # with the N-th score survives so the stable sort below picks as before
+            if 0 < max_recommendations < len(scores):
+                cutoff = np.partition(scores, len(scores) - max_recommendations)[len(scores) - max_recommendations]
+                keep = scores >= cutoff
+                candidates, scores = candidates[keep], scores[keep]
+            order = np.lexsort((candidates, -scores))[:max_recommendations]
+            
+            # Create recommendations for the selected users, best first
             recommendations = []
-            for other_idx, similarity_score in enumerate(user_similarities):
-                # Skip self and low similarity scores
-                if other_idx != user_idx and similarity_score > self.min_similarity_threshold:
-                    other_user = df.iloc[other_idx]
-                    
-                    # Calculate confidence level
-                    confidence_level = calculate_recommendation_confidence(similarity_score)
-                    
-                    # Generate explanation
-                    reason, mutual_interests, complementary_goals = self._generate_recommendation_explanation(
-                        user_data, other_user, similarity_score
-                    )
-                    
-                    recommendation = {
-                        'user_id': int(user_data['user_id']),
-                        'user_name': user_data['name'],
-                        'recommended_user_id': int(other_user['user_id']),
-                        'recommended_user_name': other_user['name'],
-                        'recommended_user_company': other_user['company'],
-                        'recommended_user_title': other_user['job_title'],
-                        'similarity_score': float(similarity_score),
-                        'confidence_level': confidence_level,
-                        'reason': reason,
-                        'mutual_interests': mutual_interests,
-                        'complementary_goals': complementary_goals
-                    }
-                    
-                    recommendations.append(recommendation)
+            confidence_levels = confidence_levels_batch(scores[order]).tolist()
+            for other_idx, similarity_score, confidence_level in zip(
+                candidates[order], scores[order], confidence_levels
+            ):
+                other_user = profiles[other_idx]
+                
+                # Generate explanation
+                reason, mutual_interests, complementary_goals = self._generate_recommendation_explanation(
+                    user_data, other_user, similarity_score
+                )
+                
+                recommendation = {
+                    'user_id': int(user_data['user_id']),
+                    'user_name': user_data['name'],
+                    'recommended_user_id': int(other_user['user_id']),
+                    'recommended_user_name': other_user['name'],
+                    'recommended_user_company': other_user['company'],
+                    'recommended_user_title': other_user['job_title'],
+                    'similarity_score': float(similarity_score),
+                    'confidence_level': confidence_level,
+                    'reason': reason,
+                    'mutual_interests': mutual_interests,
+                    'complementary_goals': complementary_goals
+                }
+                
+                recommendations.append(recommendation)
             
-            # Sort by similarity score and return top N
-            recommendations.sort(key=lambda x: x['similarity_score'], reverse=True)
-            return recommendations[:max_recommendations]
+            return recommendations
             
         except Exception as e:
             logger.error(f"Error generating user recommendations: {str(e)}")
             return []
     
     def _generate_recommendation_explanation(self, 
-                                           user1: pd.Series, 
-                                           user2: pd.Series,
+                                           user1: Dict, 
+                                           user2: Dict,
                                            similarity_score: float) -> Tuple[str, List[str], List[str]]:
         """
         Generate human-readable explanation for recommendation
         
         Args:
-            user1, user2: User data series
+            user1, user2: User records from _profile_records
             similarity_score: Calculated similarity score
             
         Returns:
@@ -342,11 +540,11 @@ class RecommendationEngine:
             complementary_goals = []
             
             # Check industry match
-            if user1.get('industry') and user1['industry'] == user2.get('industry'):
+            if user1['industry_id'] is not None and user1['industry_id'] == user2['industry_id']:
                 reasons.append(f"Both work in {user1['industry']}")
             
             # Check company match
-            if user1.get('company') and user1['company'] == user2.get('company'):
+            if user1['company_id'] is not None and user1['company_id'] == user2['company_id']:
                 reasons.append(f"Both work at {user1['company']}")
             
             # Check experience level similarity
@@ -356,21 +554,16 @@ class RecommendationEngine:
                 reasons.append("Similar experience levels")
             
             # Analyze interests overlap
-            interests1 = set((user1.get('interests', '') or '').lower().split(', '))
-            interests2 = set((user2.get('interests', '') or '').lower().split(', '))
-            interests1.discard('')  # Remove empty strings
-            interests2.discard('')
-            
-            common_interests = interests1.intersection(interests2)
+            common_interests = user1['interest_bits'] & user2['interest_bits']
             if common_interests:
-                mutual_interests = list(common_interests)[:3]  # Top 3
+                mutual_interests = self._decode_interest_bits(
+                    common_interests, user1['interest_vocab'], limit=3
+                )
                 reasons.append(f"Shared interests: {', '.join(mutual_interests[:2])}")
             
             # Analyze complementary goals
-            goals1 = set((user1.get('goals', '') or '').lower().split(', '))
-            goals2 = set((user2.get('goals', '') or '').lower().split(', '))
-            goals1.discard('')
-            goals2.discard('')
+            goals1 = user1['goal_set']
+            goals2 = user2['goal_set']
             
             # Look for complementary patterns (learn/teach, hire/job search)
             if 'learn' in goals1 and 'teach' in goals2:
@@ -414,25 +607,52 @@ class RecommendationEngine:
             recommendations: List of recommendation dictionaries
         """
         try:
-            # Clear existing recommendations for this event
-            db.query(Recommendation).filter(
-                Recommendation.event_id == event_id
-            ).delete()
-            
-            # Insert new recommendations
-            for rec in recommendations:
-                db_recommendation = Recommendation(
-                    user_id=rec['user_id'],
-                    recommended_user_id=rec['recommended_user_id'],
-                    event_id=event_id,
-                    similarity_score=rec['similarity_score'],
-                    confidence_level=rec['confidence_level'],
-                    reason=rec['reason'],
-                    mutual_interests=json.dumps(rec['mutual_interests']),
-                    complementary_goals=json.dumps(rec['complementary_goals']),
-                    algorithm_version="1.0"
+            run_started = datetime.utcnow()
+            
+            # Plain mappings skip ORM instrumentation and the identity map
+            mappings = [{
+                'user_id': rec['user_id'],
+                'recommended_user_id': rec['recommended_user_id'],
+                'event_id': event_id,
+                'similarity_score': rec['similarity_score'],
+                'confidence_level': rec['confidence_level'],
+                'reason': rec['reason'],
+                'mutual_interests': json.dumps(rec['mutual_interests']),
+                'complementary_goals': json.dumps(rec['complementary_goals']),
+                'algorithm_version': "1.0",
+                'is_active': True,
+                'updated_at': run_started
+            } for rec in recommendations]
+            
+            upsert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+            if upsert is None:
+                # No ON CONFLICT support: clear the event and insert fresh rows
+                db.query(Recommendation).filter(
+                    Recommendation.event_id == event_id
+                ).delete()
+                for start in range(0, len(mappings), self.INSERT_BATCH_SIZE):
+                    db.bulk_insert_mappings(
+                        Recommendation, mappings[start:start + self.INSERT_BATCH_SIZE]
+                    )
+                    db.flush()
+            else:
+                # Upsert on the (user, recommended user, event) unique key so
+                # existing rows keep their ids and feedback stays attached
+                stmt = upsert(Recommendation)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['user_id', 'recommended_user_id', 'event_id'],
+                    set_={column: stmt.excluded[column] for column in UPSERT_UPDATE_COLUMNS}
                 )
-                db.add(db_recommendation)
+                for start in range(0, len(mappings), self.INSERT_BATCH_SIZE):
+                    db.execute(stmt, mappings[start:start + self.INSERT_BATCH_SIZE])
+                
+                # Pairs this run no longer recommends are retired rather than
+                # deleted; cleanup_old_data purges inactive rows later
+                db.query(Recommendation).filter(
+                    Recommendation.event_id == event_id,
+                    Recommendation.is_active == True,
+                    Recommendation.updated_at < run_started
+                ).update({'is_active': False}, synchronize_session=False)
             
             db.commit()
             logger.info(f"Saved {len(recommendations)} recommendations to database")
@@ -465,10 +685,12 @@ class RecommendationEngine:
                 Recommendation.is_active == True
             ).order_by(Recommendation.similarity_score.desc()).limit(limit).all()
             
+            # Get recommended user details in one lookup (cache misses share a query)
+            users = get_user_snapshots(db, [rec.recommended_user_id for rec in recommendations])
+            
             result = []
             for rec in recommendations:
-                # Get recommended user details
-                user = db.query(User).filter(User.id == rec.recommended_user_id).first()
+                user = users.get(rec.recommended_user_id)
                 if user:
                     result.append({
                         'recommended_user_id': rec.recommended_user_id,
@@ -0,0 +1,76 @@
+"""
+Shared pytest fixtures for the Event Networking AI test suite
+"""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Point the application engine at an in-memory database before anything
+# imports the settings, so the suite never creates or mutates a database file
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Single app instance and TestClient shared by the whole session"""
+    from main import app
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def sample_engine():
+    """In-memory database holding the sample dataset, separate from the app's"""
+    from models.database import Base
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def sample_data(sample_engine):
+    """Seed the sample dataset once per session and return its stats"""
+    from database.sample_data import create_sample_data
+    return create_sample_data(force_recreate=True, engine=sample_engine)
+
+
+@pytest.fixture
+def sample_db(sample_engine, sample_data):
+    """
+    Per-test session over the seeded database, wired into the app's get_db.
+    Everything runs in one outer transaction (route commits only release
+    savepoints) that is rolled back afterwards, so tests never reseed
+    """
+    from sqlalchemy.orm import Session
+    from database.connection import get_db
+    from main import app
+
+    connection = sample_engine.connect()
+    transaction = connection.begin()
+    if connection.dialect.name == "sqlite":
+        # pysqlite defers BEGIN until the first write, so releasing the first
+        # savepoint would commit; open the outer transaction explicitly
+        connection.exec_driver_sql("BEGIN")
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = lambda: session
+    try:
+        yield session
+    finally:
+        if previous_override is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous_override
+        session.close()
+        transaction.rollback()
+        connection.close()
@@ -1,15 +1,22 @@
+import json
+import math
 import pytest
-from fastapi.testclient import TestClient
-from main import app
+from datetime import datetime, timedelta
+from api.responses import PydanticJSONResponse
+from config.settings import settings
+from models.database import Event, User, Recommendation
+from services.data_service import RECOMMENDATION_CSV_COLUMNS
 
-client = TestClient(app)
-
-def test_health_check():
+def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
-def test_create_user_and_get_user():
+def test_non_finite_floats_render_as_null():
+    response = PydanticJSONResponse({"score": math.nan, "average": math.inf, "low": -math.inf, "ok": 0.5})
+    assert json.loads(response.body) == {"score": None, "average": None, "low": None, "ok": 0.5}
+
+def test_create_user_and_get_user(client, sample_db):
     user_data = {
         "name": "Test User",
         "email": "testuser@example.com",
@@ -22,18 +29,19 @@ def test_create_user_and_get_user():
         "interests": ["AI", "Networking"],
         "goals": ["Meet founders", "Find cofounder"]
     }
-    create_resp = client.post("/users", json=user_data)
+    create_resp = client.post("/api/v1/users", json=user_data)
     assert create_resp.status_code == 201
     user_id = create_resp.json()["id"]
-    get_resp = client.get(f"/users/{user_id}")
+    get_resp = client.get(f"/api/v1/users/{user_id}")
     assert get_resp.status_code == 200
     assert get_resp.json()["email"] == user_data["email"]
+    assert get_resp.json()["profile_completeness"] == create_resp.json()["profile_completeness"] > 0
 
-def test_create_event_and_register_user():
+def test_create_event_and_register_user(client, sample_db):
     event_data = {
         "name": "Test Event",
         "description": "A test event.",
-        "date": "2025-08-01T10:00:00",
+        "date": (datetime.now() + timedelta(days=30)).isoformat(),
         "location": "Toronto",
         "venue": "Test Venue",
         "city": "Toronto",
@@ -41,7 +49,7 @@ def test_create_event_and_register_user():
         "max_attendees": 100,
         "event_type": "Conference"
     }
-    event_resp = client.post("/events", json=event_data)
+    event_resp = client.post("/api/v1/events", json=event_data)
     assert event_resp.status_code == 201
     event_id = event_resp.json()["id"]
     # Create a user
@@ -57,16 +65,60 @@ def test_create_event_and_register_user():
         "interests": ["Events"],
         "goals": ["Network"]
     }
-    user_resp = client.post("/users", json=user_data)
+    user_resp = client.post("/api/v1/users", json=user_data)
     assert user_resp.status_code == 201
     user_id = user_resp.json()["id"]
-    reg_resp = client.post(f"/events/{event_id}/register/{user_id}")
+    reg_resp = client.post(f"/api/v1/events/{event_id}/register/{user_id}")
     assert reg_resp.status_code == 200
     assert "successfully registered" in reg_resp.json()["message"]
 
-def test_visualization_cluster_map_empty():
+def test_event_status_fields(client, sample_db):
+    event_data = {
+        "name": "Tiny Event",
+        "date": (datetime.now() + timedelta(days=30)).isoformat(),
+        "location": "Toronto",
+        "max_attendees": 1
+    }
+    event_resp = client.post("/api/v1/events", json=event_data)
+    assert event_resp.status_code == 201
+    event = event_resp.json()
+    assert event["is_full"] is False
+    assert event["is_upcoming"] is True
+
+    user = sample_db.query(User).order_by(User.id).first()
+    assert client.post(f"/api/v1/events/{event['id']}/register/{user.id}").status_code == 200
+    event = client.get(f"/api/v1/events/{event['id']}").json()
+    assert event["attendee_count"] == 1
+    assert event["is_full"] is True
+
+    past = sample_db.get(Event, event["id"])
+    past.date = datetime.now() - timedelta(days=1)
+    sample_db.flush()
+    assert client.get(f"/api/v1/events/{event['id']}").json()["is_upcoming"] is False
+
+def test_visualization_cluster_map_empty(client, sample_db):
     # Should return 404 for non-existent event
-    resp = client.get("/visualization/cluster-map?event_id=99999")
+    resp = client.get("/api/v1/visualization/cluster-map?event_id=99999")
     assert resp.status_code == 404
     assert "error" in resp.json()
 
+
+def test_export_recommendations_csv(client, sample_db, monkeypatch):
+    event = sample_db.query(Event).order_by(Event.id).first()
+    users = sample_db.query(User).order_by(User.id).limit(2).all()
+    sample_db.add(Recommendation(event_id=event.id, user_id=users[0].id, recommended_user_id=users[1].id, similarity_score=0.75, confidence_level="high", reason="Shared interests", is_active=True))
+    sample_db.flush()
+
+    resp = client.get(f"/api/v1/analytics/event/{event.id}/recommendations.csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    lines = resp.text.splitlines()
+    assert lines[0] == ",".join(RECOMMENDATION_CSV_COLUMNS)
+    assert f"{users[0].id},{users[1].id},0.75,high,Shared interests" in lines[1:]
+
+    resp = client.get("/api/v1/analytics/event/99999/recommendations.csv")
+    assert resp.status_code == 404
+
+    monkeypatch.setattr(settings, "enable_data_export", False)
+    resp = client.get(f"/api/v1/analytics/event/{event.id}/recommendations.csv")
+    assert resp.status_code == 403
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from models.database import Base, User, UserInterest
+from database.cache import get_user_snapshot, user_cache
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+Session = sessionmaker(bind=engine)
+Base.metadata.create_all(engine)
+
+@pytest.fixture
+def db_session():
+    session = Session()
+    yield session
+    session.close()
+
+def _create_user(db_session, email):
+    user = User(name="Erin", email=email, job_title="Engineer", company="E", industry="Tech", bio="Bio", experience_years=2)
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+def test_update_invalidates_on_commit(db_session):
+    user = _create_user(db_session, "erin.update@example.com")
+    assert get_user_snapshot(db_session, user.id).name == "Erin"
+
+    user.name = "Erin Updated"
+    db_session.commit()
+    assert get_user_snapshot(db_session, user.id).name == "Erin Updated"
+
+def test_delete_invalidates_on_commit(db_session):
+    user = _create_user(db_session, "erin.delete@example.com")
+    user_id = user.id
+    assert get_user_snapshot(db_session, user_id) is not None
+
+    db_session.delete(user)
+    db_session.commit()
+    assert get_user_snapshot(db_session, user_id) is None
+
+def test_rollback_keeps_committed_snapshot(db_session):
+    user = _create_user(db_session, "erin.rollback@example.com")
+    assert get_user_snapshot(db_session, user.id).name == "Erin"
+
+    user.name = "Never Committed"
+    db_session.flush()
+    db_session.rollback()
+    assert get_user_snapshot(db_session, user.id).name == "Erin"
+
+def test_rollback_drops_rows_cached_inside_transaction(db_session):
+    user = _create_user(db_session, "erin.phantom@example.com")
+    user_id = user.id
+    user_cache.clear()
+
+    # Cache is filled from a flushed but uncommitted interest
+    db_session.add(UserInterest(user_id=user_id, interest="Phantom"))
+    db_session.flush()
+    assert get_user_snapshot(db_session, user_id).interests == ("Phantom",)
+
+    db_session.rollback()
+    assert get_user_snapshot(db_session, user_id).interests == ()
@@ -1,11 +1,20 @@
 import pytest
+from datetime import datetime
+import networkx as nx
+import numpy as np
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from models.database import Base, User, Event, EventAttendee
 from services.clustering_service import ClusteringService
+from utils.helpers import _BASE_PALETTE
 
 # Use in-memory SQLite for isolated testing
-engine = create_engine("sqlite:///:memory:")
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
 Session = sessionmaker(bind=engine)
 Base.metadata.create_all(engine)
 
@@ -23,7 +32,7 @@ def test_create_network_graph_empty(db_session):
 
 def test_create_network_graph_with_attendees(db_session):
     # Setup: create event and users
-    event = Event(name="Test Event", description="desc", date="2025-08-01T10:00:00", location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    event = Event(name="Test Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
     db_session.add(event)
     db_session.commit()
     user1 = User(name="Alice", email="alice@example.com", job_title="Engineer", company="A", industry="Tech", bio="Bio", experience_years=2, linkedin_url="", created_at=None, updated_at=None)
@@ -39,7 +48,7 @@ def test_create_network_graph_with_attendees(db_session):
 
 # Additional: test analyze_clusters returns expected structure
 def test_analyze_clusters_returns_response(db_session):
-    event = Event(name="Cluster Event", description="desc", date="2025-08-01T10:00:00", location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    event = Event(name="Cluster Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
     db_session.add(event)
     db_session.commit()
     user1 = User(name="Carol", email="carol@example.com", job_title="Scientist", company="C", industry="Tech", bio="Bio", experience_years=4, linkedin_url="", created_at=None, updated_at=None)
@@ -50,9 +59,57 @@ def test_analyze_clusters_returns_response(db_session):
     db_session.commit()
     clustering_service = ClusteringService()
     # Use default algorithm and min_cluster_size
-    try:
-        response = clustering_service.analyze_clusters(db_session, event_id=event.id, algorithm=None, min_cluster_size=None)
-        assert hasattr(response, 'clusters')
-        assert isinstance(response.clusters, list)
-    except Exception as e:
-        pytest.skip(f"analyze_clusters not fully implemented or missing dependencies: {e}")
+    response = clustering_service.analyze_clusters(db_session, event_id=event.id, fast_approx=True)
+    assert hasattr(response, 'clusters')
+    assert isinstance(response.clusters, list)
+
+def test_analyze_clusters_fast_approx(db_session):
+    event = Event(name="Fast Cluster Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    db_session.add(event)
+    db_session.commit()
+    users = [
+        User(name=f"Fast {i}", email=f"fast{i}@example.com", job_title="Data Scientist", company="F", industry="Tech", bio="Machine learning and data science", experience_years=4)
+        for i in range(4)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    db_session.add_all([EventAttendee(event_id=event.id, user_id=user.id) for user in users])
+    db_session.commit()
+    clustering_service = ClusteringService()
+    response = clustering_service.analyze_clusters(db_session, event_id=event.id, algorithm="louvain", fast_approx=True)
+    assert response.cluster_stats["total_nodes"] == 4
+    assert sum(cluster.size for cluster in response.clusters) <= 4
+
+def test_export_network_shares_palette_colors(db_session):
+    event = Event(name="Palette Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    db_session.add(event)
+    db_session.commit()
+    users = [
+        User(name=f"Palette {i}", email=f"palette{i}@example.com", job_title="Data Scientist", company="P", industry="Tech", bio="Machine learning and data science", experience_years=4)
+        for i in range(4)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    db_session.add_all([EventAttendee(event_id=event.id, user_id=user.id) for user in users])
+    db_session.commit()
+    network = ClusteringService().export_network_for_visualization(db_session, event_id=event.id)
+    assert len(network.nodes) == 4
+    # Node colors are the palette's own string objects, not per-node copies
+    assert all(any(node.color is color for color in _BASE_PALETTE) for node in network.nodes)
+
+def test_single_level_louvain_is_finer_than_full():
+    G = nx.karate_club_graph()
+    clustering_service = ClusteringService()
+    single_level = clustering_service.detect_communities(G, "louvain", fast_approx=True)
+    full = clustering_service.detect_communities(G, "louvain")
+    assert set(single_level) == set(G.nodes())
+    assert len(set(single_level.values())) >= len(set(full.values()))
+
+def test_edgeless_graph_skips_detection_and_modularity():
+    G = nx.empty_graph(5)
+    clustering_service = ClusteringService()
+    membership = clustering_service.detect_communities(G, "louvain")
+    assert sorted(membership.values()) == [0, 1, 2, 3, 4]
+    stats = clustering_service._calculate_cluster_stats(G, np.array([membership[node] for node in G.nodes()]))
+    assert stats["num_clusters"] == 5
+    assert stats["modularity"] == 0.0
@@ -0,0 +1,92 @@
+import asyncio
+import httpx
+import pytest
+from unittest import mock
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from services import linkedin_service
+from services.linkedin_service import _RateLimiter, _RateLimitedAdapter, _SESSION, LinkedInService
+
+def _response(status_code, headers=None):
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+def test_rate_limiter_honours_retry_after():
+    limiter = _RateLimiter()
+    limiter.update(429, {"Retry-After": "5"})
+    assert 4 < limiter.delay() <= 5
+
+def test_rate_limiter_backs_off_when_quota_exhausted():
+    limiter = _RateLimiter()
+    limiter.update(200, {"X-RateLimit-Remaining": "0"})
+    assert limiter.delay() > _RateLimiter.DEFAULT_BACKOFF - 1
+
+def test_rate_limiter_allows_requests_with_quota_left():
+    limiter = _RateLimiter()
+    limiter.update(200, {"X-RateLimit-Remaining": "42"})
+    assert limiter.remaining == 42
+    assert limiter.delay() == 0.0
+
+def test_session_does_not_retry_429_below_the_limiter():
+    adapter = _SESSION.get_adapter("https://api.linkedin.com/")
+    assert 429 not in adapter.max_retries.status_forcelist
+
+def test_adapter_waits_out_429_before_next_request(monkeypatch):
+    limiter = _RateLimiter()
+    monkeypatch.setattr(linkedin_service, "_RATE_LIMITER", limiter)
+    adapter = _RateLimitedAdapter()
+    request = PreparedRequest()
+    request.prepare(method="GET", url="https://api.linkedin.com/v2/me")
+    with mock.patch.object(HTTPAdapter, "send", return_value=_response(429, {"Retry-After": "3"})), \
+            mock.patch.object(linkedin_service.time, "sleep") as sleep:
+        adapter.send(request)
+        sleep.assert_not_called()
+        adapter.send(request)
+    assert sleep.call_count == 1
+    assert 2 < sleep.call_args[0][0] <= 3
+
+@pytest.mark.parametrize("headline, expected", [
+    ("Python developer | AI & Machine Learning", ["Python", "Ai", "Machine Learning"]),
+    ("AWS-certified cloud architect", ["Cloud", "Aws"]),
+    ("Head of HR and Strategy", ["Hr", "Strategy"]),
+    ("Pythonista building ReactJS apps", []),
+    ("Open source maintainer at Chrome", []),
+])
+def test_headline_keywords_match_whole_words(headline, expected):
+    assert LinkedInService._headline_interests(headline) == expected
+
+def _connections_service(handler):
+    service = LinkedInService(redis_client=None)
+    service._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+def test_fetch_connections_async_fans_out_pages_in_order():
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        start = int(request.url.params["start"])
+        assert request.url.params["count"] == "2"
+        elements = [{"to~": {"id": f"m{start + i}", "localizedFirstName": "Member", "localizedLastName": str(start + i)}}
+                    for i in range(2)]
+        return httpx.Response(200, json={"elements": elements})
+
+    service = _connections_service(handler)
+    connections = asyncio.run(service.fetch_connections_async("token", total_pages=6, page_size=2, concurrency=3))
+    assert [c["linkedin_id"] for c in connections] == [f"m{n}" for n in range(12)]
+    assert 1 < peak <= 3
+
+def test_fetch_connections_async_returns_nothing_without_permission():
+    def handler(request):
+        if request.url.params["start"] == "50":
+            return httpx.Response(403)
+        return httpx.Response(200, json={"elements": [{"to~": {"id": "m1"}}]})
+
+    service = _connections_service(handler)
+    assert asyncio.run(service.fetch_connections_async("token", total_pages=3)) == []
@@ -1,10 +1,17 @@
 import pytest
+from datetime import datetime
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from models.database import Base, User, Event, EventAttendee, UserInterest, UserGoal
+from sqlalchemy.pool import StaticPool
+from models.database import Base, User, Event, EventAttendee, UserInterest, UserGoal, Recommendation
 from services.recommendation_engine import RecommendationEngine
+from config.settings import settings
 
-engine = create_engine("sqlite:///:memory:")
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
 Session = sessionmaker(bind=engine)
 Base.metadata.create_all(engine)
 
@@ -16,7 +23,7 @@ def db_session():
 
 def test_generate_recommendations_basic(db_session):
     # Setup: create event and users with interests/goals
-    event = Event(name="Rec Event", description="desc", date="2025-08-01T10:00:00", location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    event = Event(name="Rec Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
     db_session.add(event)
     db_session.commit()
     user1 = User(name="Eve", email="eve@example.com", job_title="Engineer", company="A", industry="Tech", bio="AI enthusiast", experience_years=2, linkedin_url="", created_at=None, updated_at=None)
@@ -38,7 +45,7 @@ def test_generate_recommendations_basic(db_session):
     assert any(r["recommended_user_id"] == user2.id for r in recs)
 
 def test_generate_recommendations_no_matches(db_session):
-    event = Event(name="Empty Event", description="desc", date="2025-08-01T10:00:00", location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    event = Event(name="Empty Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
     db_session.add(event)
     db_session.commit()
     user1 = User(name="Solo", email="solo@example.com", job_title="Engineer", company="A", industry="Tech", bio="Solo bio", experience_years=2, linkedin_url="", created_at=None, updated_at=None)
@@ -52,7 +59,7 @@ def test_generate_recommendations_no_matches(db_session):
 
 def test_generate_recommendations_invalid_user(db_session):
     # Setup: create event and a user
-    event = Event(name="Invalid User Event", description="desc", date="2025-08-01T10:00:00", location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    event = Event(name="Invalid User Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
     db_session.add(event)
     db_session.commit()
     user1 = User(name="Valid", email="valid@example.com", job_title="Engineer", company="A", industry="Tech", bio="Bio", experience_years=2, linkedin_url="", created_at=None, updated_at=None)
@@ -73,7 +80,7 @@ def test_generate_recommendations_invalid_event(db_session):
 
 # Additional: test output structure for recommendations
 def test_recommendation_output_structure(db_session):
-    event = Event(name="Struct Event", description="desc", date="2025-08-01T10:00:00", location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    event = Event(name="Struct Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
     db_session.add(event)
     db_session.commit()
     user1 = User(name="Anna", email="anna@example.com", job_title="Engineer", company="A", industry="Tech", bio="AI", experience_years=2, linkedin_url="", created_at=None, updated_at=None)
@@ -97,3 +104,88 @@ def test_recommendation_output_structure(db_session):
         assert "recommended_user_name" in rec
         assert "similarity_score" in rec
         assert "reason" in rec
+
+def test_parallel_matches_serial(db_session, monkeypatch):
+    event = Event(name="Parallel Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=50, event_type="Conference")
+    db_session.add(event)
+    db_session.commit()
+    topics = ["AI", "Finance", "Health", "Python", "Marketing"]
+    users = [
+        User(name=f"Member {i}", email=f"member{i}@example.com", job_title="Engineer" if i % 2 else "Analyst", company=f"C{i % 4}", industry="Tech" if i % 3 else "Finance", bio=f"Works on {topics[i % 5]} and {topics[(i + 2) % 5]}", experience_years=i % 12)
+        for i in range(24)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    for i, user in enumerate(users):
+        db_session.add_all([
+            EventAttendee(event_id=event.id, user_id=user.id),
+            UserInterest(user_id=user.id, interest=topics[i % 5]),
+            UserInterest(user_id=user.id, interest=topics[(i + 1) % 5]),
+            UserGoal(user_id=user.id, goal="Network")
+        ])
+    db_session.commit()
+    engine = RecommendationEngine()
+
+    monkeypatch.setattr(settings, "parallel_recommendation_min_attendees", 10_000)
+    serial = engine.generate_recommendations(db=db_session, event_id=event.id, max_recommendations=5)
+    monkeypatch.setattr(settings, "parallel_recommendation_min_attendees", 1)
+    monkeypatch.setattr(settings, "parallel_recommendation_jobs", 4)
+    parallel = engine.generate_recommendations(db=db_session, event_id=event.id, max_recommendations=5)
+
+    assert serial
+    assert parallel == serial
+
+def test_similarity_cache_is_per_engine_config(db_session):
+    event = Event(name="Config Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    db_session.add(event)
+    db_session.commit()
+    users = [
+        User(name=f"Config {i}", email=f"config{i}@example.com", job_title="Engineer", company=f"K{i}", industry="Tech", bio=f"Builds data pipelines and machine learning model {i}", experience_years=i)
+        for i in range(4)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    db_session.add_all([EventAttendee(event_id=event.id, user_id=user.id) for user in users])
+    db_session.commit()
+    wide, narrow = RecommendationEngine(), RecommendationEngine(max_features=2)
+    df = wide.get_event_attendees_data(db_session, event.id)
+
+    wide_matrix = wide._get_similarity_matrix(db_session, event.id, df, 5)
+    narrow_matrix = narrow._get_similarity_matrix(db_session, event.id, df, 5)
+    assert narrow_matrix is not wide_matrix
+    assert wide._get_similarity_matrix(db_session, event.id, df, 5) is wide_matrix
+    assert RecommendationEngine()._get_similarity_matrix(db_session, event.id, df, 5) is wide_matrix
+
+def test_save_recommendations_upserts_and_retires(db_session):
+    event = Event(name="Upsert Event", description="desc", date=datetime(2025, 8, 1, 10, 0), location="Toronto", venue="Venue", city="Toronto", country="Canada", max_attendees=10, event_type="Conference")
+    db_session.add(event)
+    db_session.commit()
+    users = [User(name=f"Saver {i}", email=f"saver{i}@example.com") for i in range(3)]
+    db_session.add_all(users)
+    db_session.commit()
+    a, b, c = (user.id for user in users)
+
+    def rec(user_id, recommended_user_id, score):
+        return {"user_id": user_id, "recommended_user_id": recommended_user_id, "similarity_score": score, "confidence_level": "medium", "reason": "Shared interests", "mutual_interests": [], "complementary_goals": []}
+
+    def rows():
+        db_session.expire_all()
+        return {
+            (r.user_id, r.recommended_user_id): r
+            for r in db_session.query(Recommendation).filter(Recommendation.event_id == event.id)
+        }
+
+    engine = RecommendationEngine()
+    engine._save_recommendations_to_db(db_session, event.id, [rec(a, b, 0.5), rec(a, c, 0.4)])
+    first = rows()
+    kept_id = first[(a, b)].id
+
+    engine._save_recommendations_to_db(db_session, event.id, [rec(a, b, 0.9), rec(b, c, 0.7)])
+    second = rows()
+
+    assert set(second) == {(a, b), (a, c), (b, c)}
+    assert second[(a, b)].id == kept_id
+    assert second[(a, b)].similarity_score == 0.9
+    assert second[(a, b)].is_active
+    assert not second[(a, c)].is_active
+    assert second[(b, c)].is_active